@@ -0,0 +1,299 @@
+"""
+Cleans many files in parallel, without the GUI.
+
+The files are given as directories (every supported file in them) or glob patterns,
+and cleaned with a recipe, a pipeline saved with pipeline.Pipeline.save. Every file is
+cleaned in its own worker process, with an optional memory budget, and gets a cleaned
+output and a JSON report in the output directory.
+
+A manifest in the output directory records every finished file. When a run is
+interrupted and restarted, the files that were finished with the same recipe and have
+not changed since are skipped; failed and unfinished files are cleaned again.
+
+Usage
+-----
+python batchClean.py data/ "archive/*.xlsx" --recipe pipeline.json --output-dir cleaned --workers 4 --memory-mb 2048
+"""
+import argparse
+import collections
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+MANIFEST = "manifest.jsonl"
+
+def find_files(inputs, recursive=False):
+    """
+    Returns the supported files of the given directories and glob patterns.
+
+    Parameters
+    ----------
+    inputs : list
+        Directories, file paths or glob patterns.
+    recursive : bool, optional
+        If True, directories are searched recursively and "**" patterns match
+        subdirectories. The default is False.
+
+    Returns
+    -------
+    list
+        The sorted absolute paths of the files, without repetitions.
+    """
+    from cleanData import FILE_FORMATS
+
+    files = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            pattern = os.path.join(item, "**", "*") if recursive else os.path.join(item, "*")
+            matches = glob.glob(pattern, recursive=recursive)
+        else:
+            matches = glob.glob(item, recursive=recursive)
+        for path in matches:
+            extension = os.path.splitext(path)[1].lower().lstrip(".")
+            if os.path.isfile(path) and extension in FILE_FORMATS and extension != "sql":
+                files.add(os.path.abspath(path))
+    return sorted(files)
+
+def output_names(files):
+    """
+    Returns the output name of each file: its name, prefixed by as many parent
+    directories as needed to tell apart files with the same name.
+    """
+    names = {}
+    depth = 1
+    while True:
+        names = {path: "__".join(os.path.normpath(path).split(os.sep)[-depth:]) for path in files}
+        if len(set(names.values())) == len(files):
+            return names
+        depth += 1
+
+def file_state(path):
+    """Returns the size and modification time of a file, used to detect changes."""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def read_manifest(path):
+    """
+    Returns the last manifest entry of every file, skipping a truncated last line.
+    """
+    entries = {}
+    if not os.path.exists(path):
+        return entries
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            entries[entry["path"]] = entry
+    return entries
+
+def _limit_memory(memory_mb):
+    #runs in each worker: allocations over the budget raise MemoryError
+    if memory_mb and resource is not None:
+        limit = int(memory_mb * 1024**2)
+        kind = getattr(resource, "RLIMIT_DATA", resource.RLIMIT_AS)
+        resource.setrlimit(kind, (limit, limit))
+
+def clean_file(path, recipe, output, report, chunksize=None):
+    """
+    Cleans one file with a recipe and writes its output and its report.
+
+    The output and the report are written to temporary files and renamed, so an
+    interrupted run never leaves a partial file behind.
+
+    Parameters
+    ----------
+    path : str
+        The file to be cleaned.
+    recipe : str
+        The recipe, as written by Pipeline.to_json.
+    output : str
+        The path of the cleaned csv file.
+    report : str
+        The path of the JSON report.
+    chunksize : int, optional
+        If given, the file is streamed in batches of chunksize rows; steps that need the
+        whole data still load it. The default is None.
+
+    Returns
+    -------
+    dict
+        The report: the file, its output, the status, the rows before and after, the
+        missing values before and after, the duration, the optimized plan, the column
+        formats, the traced steps and the messages printed by the cleaning methods.
+    """
+    import cleanData as cd
+    from pipeline import Pipeline
+    from tracing import Tracer
+
+    start = time.perf_counter()
+    pipeline = Pipeline.from_json(recipe)
+    tracer = Tracer()
+    result = {"path": path, "output": output, "status": "done", "error": None}
+    #the messages of the cleaning methods go to the report
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            frame = cd.DataFrame(path, chunksize=chunksize, cache=False, tracer=tracer)
+            result["rows_in"] = None if frame.streaming else len(frame.df)
+            result["missing_before"] = frame.get_missing_value().to_dict()
+            pipeline.run(frame)
+            result["rows_out"] = None if frame.streaming else len(frame.df)
+            result["missing_after"] = frame.get_missing_value().to_dict()
+            result["column_formats"] = frame.column_formats
+            frame.to_csv(output + ".tmp")
+        os.replace(output + ".tmp", output)
+    except MemoryError:
+        result.update(status="failed", error="The memory budget was exceeded")
+    except Exception as exception:
+        result.update(status="failed", error=repr(exception))
+    result["seconds"] = time.perf_counter() - start
+    result["log"] = log.getvalue().splitlines()
+    result["plan"] = pipeline.optimize()
+    result["steps"] = [{key: record[key] for key in ("method", "depth", "wall", "rows_in", "rows_out")}
+                       for record in tracer.records]
+
+    with open(report + ".tmp", "w") as f:
+        json.dump(result, f, indent=4, default=str)
+    os.replace(report + ".tmp", report)
+    return result
+
+def _pool(workers, memory_mb):
+    #a fresh worker per file returns its memory to the system between files
+    try:
+        return ProcessPoolExecutor(max_workers=workers, initializer=_limit_memory, initargs=(memory_mb,),
+                                   max_tasks_per_child=1)
+    except TypeError:
+        return ProcessPoolExecutor(max_workers=workers, initializer=_limit_memory, initargs=(memory_mb,))
+
+def run(files, recipe, output_dir, workers=None, memory_mb=None, chunksize=None, force=False):
+    """
+    Cleans files in parallel, skipping the ones the manifest records as finished.
+
+    When a worker process dies, only the file it was cleaning is recorded as failed: the
+    files that were running next to it are cleaned again one at a time to find it, and
+    the other files are cleaned in a new pool.
+
+    Parameters
+    ----------
+    files : list
+        The files to be cleaned.
+    recipe : str
+        The recipe, as written by Pipeline.to_json.
+    output_dir : str
+        The directory of the outputs, the reports and the manifest.
+    workers : int, optional
+        The number of worker processes. The default is None (the number of CPUs).
+    memory_mb : float, optional
+        The memory budget of each worker, in MB; a file that needs more fails with a
+        MemoryError instead of exhausting the machine. The default is None (no budget).
+    chunksize : int, optional
+        The batch size for streamed files, see clean_file. The default is None.
+    force : bool, optional
+        If True, finished files are cleaned again. The default is False.
+
+    Returns
+    -------
+    dict
+        The number of files 'done', 'failed' and 'skipped'.
+    """
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST)
+    manifest = {} if force else read_manifest(manifest_path)
+    recipe_digest = hashlib.blake2b(recipe.encode(), digest_size=16).hexdigest()
+    names = output_names(files)
+
+    pending = []
+    for path in files:
+        entry = manifest.get(path)
+        if (entry is not None and entry["status"] == "done" and entry["recipe"] == recipe_digest
+                and entry["state"] == file_state(path) and os.path.exists(entry["output"])):
+            continue
+        pending.append(path)
+    counts = {"done": 0, "failed": 0, "skipped": len(files) - len(pending)}
+
+    workers = workers or os.cpu_count() or 1
+    queue = collections.deque(pending)
+    suspects = collections.deque()  # files running when a worker died, retried one at a time
+    with open(manifest_path, "a") as log:
+        def record(path, result):
+            counts[result["status"]] += 1
+            log.write(json.dumps({"path": path, "state": file_state(path), "recipe": recipe_digest,
+                                  "status": result["status"], "output": result["output"],
+                                  "error": result["error"]}) + "\n")
+            log.flush()
+            os.fsync(log.fileno())
+            print(f"[{result['status']}] {path}" + (f": {result['error']}" if result["error"] else ""))
+
+        while queue or suspects:
+            #a dead worker breaks the whole pool and fails every file it still runs, so
+            #only as many files as workers are submitted at a time, and when the pool
+            #breaks the remaining files go to a new pool
+            isolated = bool(suspects)
+            source, slots = (suspects, 1) if isolated else (queue, workers)
+            running = {}
+            broken = False
+            with _pool(slots, memory_mb) as pool:
+                while (source or running) and not broken:
+                    while source and len(running) < slots:
+                        path = source.popleft()
+                        base = os.path.join(output_dir, os.path.splitext(names[path])[0])
+                        running[pool.submit(clean_file, path, recipe, base + ".cleaned.csv", base + ".report.json", chunksize)] = path
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        try:
+                            result = future.result()
+                        except BrokenProcessPool:
+                            broken = True
+                            continue
+                        record(running.pop(future), result)
+
+            if broken and (isolated or len(running) == 1):
+                #the file died on its own, e.g. killed by the system when out of memory
+                path = running.popitem()[1]
+                base = os.path.join(output_dir, os.path.splitext(names[path])[0])
+                record(path, {"status": "failed", "error": "The worker process died", "output": base + ".cleaned.csv"})
+            elif broken:
+                #any of the running files may have killed the worker
+                suspects.extend(running.values())
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("inputs", nargs="+", help="directories, files or glob patterns")
+    parser.add_argument("--recipe", required=True, help="a pipeline saved with Pipeline.save")
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--memory-mb", type=float, default=None, help="memory budget per worker")
+    parser.add_argument("--chunksize", type=int, default=None, help="stream the files in batches")
+    parser.add_argument("--recursive", action="store_true")
+    parser.add_argument("--force", action="store_true", help="clean finished files again")
+    args = parser.parse_args()
+
+    from pipeline import Pipeline
+
+    recipe = Pipeline.load(args.recipe).to_json()
+    files = find_files(args.inputs, args.recursive)
+    if not files:
+        parser.error("No supported file found")
+
+    counts = run(files, recipe, args.output_dir, args.workers, args.memory_mb, args.chunksize, args.force)
+    print(f"{counts['done']} done, {counts['failed']} failed, {counts['skipped']} skipped")
+    sys.exit(1 if counts["failed"] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Benchmarks every public method of cleanData.DataFrame on a synthetic dataset.
+
+Each method runs in a fresh interpreter, on a fresh DataFrame, after its set-up steps
+(e.g. detect_outliers before save_outliers), so the timings and memory peaks of the
+methods do not leak into each other. For every method the median wall time, the peak
+RSS of the process and the throughput in rows per second are reported.
+
+The results can be saved as a baseline and later runs compared against it: a method
+is a regression when its wall time or peak RSS grows by more than the threshold, and
+the script then exits with status 1, so it can guard releases in CI.
+
+With --chunksize the DataFrame is streamed from a CSV file and only the methods that
+support streaming are run, which allows datasets that do not fit in memory.
+
+Usage
+-----
+python benchmarks/bench_methods.py --rows 100000 --save-baseline baseline.json
+python benchmarks/bench_methods.py --rows 100000 --baseline baseline.json --threshold 0.2
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+import synthetic
+
+MIN_REGRESSION = 0.005  # seconds; slower runs under this are timer noise
+
+def _columns(frame, prefix=""):
+    names = next(frame.iter_batches()).columns if frame.streaming else frame.df.columns
+    return [col for col in names if col.startswith(prefix)]
+
+def _first(frame, prefix):
+    columns = _columns(frame, prefix)
+    return columns[0] if columns else _columns(frame)[0]
+
+def _consume(iterator):
+    return sum(1 for _ in iterator)
+
+#method: (set-up steps, timed call, supports streaming)
+CASES = {
+    "iter_batches": (None, lambda f: _consume(f.iter_batches()), True),
+    "load": (None, lambda f: f.load(), True),
+    "append": (None, lambda f: f.append(f.df.iloc[:1000]), False),
+    "get_profile": (None, lambda f: f.get_profile(), False),
+    "get_duplicates": (None, lambda f: f.get_duplicates(), False),
+    "get_amount_duplicates": (None, lambda f: f.get_amount_duplicates(), True),
+    "get_near_duplicates": (None, lambda f: f.get_near_duplicates(_columns(f, "category") + _columns(f, "date")), False),
+    "get_missing_value": (None, lambda f: f.get_missing_value(), True),
+    "get_amount_missing_values": (None, lambda f: f.get_amount_missing_values(), False),
+    "get_columns_missing_values": (None, lambda f: f.get_columns_missing_values(), False),
+    "get_general_stats": (None, lambda f: f.get_general_stats(approximate=f.streaming), True),
+    "get_sketch": (None, lambda f: f.get_sketch(), True),
+    "get_info": (None, lambda f: f.get_info(), False),
+    "get_data_report": (None, lambda f: f.get_data_report(), False),
+    "get_correlation": (None, lambda f: f.get_correlation(), False),
+    "get_features_datatypes": (None, lambda f: f.get_features_datatypes(), False),
+    "is_datetime": (None, lambda f: f.is_datetime(_first(f, "date")), False),
+    "remove_formatting": (None, lambda f: f.remove_formatting(), False),
+    "compact": (None, lambda f: f.compact(), False),
+    "save_column_formats": (lambda f: f.remove_formatting(), lambda f: f.save_column_formats(), False),
+    "categorical_to_numeric": (None, lambda f: f.categorical_to_numeric(), False),
+    "save_encodings": (lambda f: f.categorical_to_numeric(), lambda f: f.save_encodings(), False),
+    "load_encodings": (lambda f: (f.categorical_to_numeric(), f.save_encodings()), lambda f: f.load_encodings(), False),
+    "fill_column_missing_values": (None, lambda f: f.fill_column_missing_values(_first(f, "numeric"), "median"), True),
+    "fill_missing_values": (None, lambda f: f.fill_missing_values({col: "mean" for col in _columns(f, "numeric")}), True),
+    "remove_duplicates": (None, lambda f: f.remove_duplicates(), True),
+    "remove_near_duplicates": (None, lambda f: f.remove_near_duplicates(_columns(f, "category") + _columns(f, "date")), False),
+    "remove_NaN": (None, lambda f: f.remove_NaN(), True),
+    "generate_sample_size": (None, lambda f: f.generate_sample_size(len(f.df)), False),
+    "check_df_size": (None, lambda f: f.check_df_size(len(f.df)), False),
+    "fast_analysis": (None, lambda f: f.fast_analysis(), True),
+    "detect_outliers": (None, lambda f: f.detect_outliers(), False),
+    "save_outliers": (lambda f: f.detect_outliers(), lambda f: f.save_outliers(), False),
+    "load_outliers": (lambda f: (f.detect_outliers(), f.save_outliers()), lambda f: f.load_outliers(), False),
+    "handle_outliers": (lambda f: f.detect_outliers(), lambda f: f.handle_outliers(), False),
+    "get_sample": (None, lambda f: f.get_sample(), False),
+    "get_head": (None, lambda f: f.get_head(), False),
+    "to_csv": (None, lambda f: f.to_csv("output.csv"), True),
+    "to_xlsx": (None, lambda f: f.to_xlsx("output.xlsx"), False),
+    "head_image": (None, lambda f: f.head_image(), False),
+}
+
+def public_methods():
+    """Returns the names of the public methods of cleanData.DataFrame."""
+    import cleanData as cd
+
+    return [name for name, value in vars(cd.DataFrame).items() if not name.startswith("_") and callable(value)]
+
+def peak_rss_mb():
+    """Returns the peak resident set size of the process in MB, or None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    #bytes on macOS, kilobytes elsewhere
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+def run_worker(method, data_path, chunksize):
+    """
+    Runs one method in this process and prints its measures as JSON.
+    """
+    import pandas as pd
+    import cleanData as cd
+
+    setup, call, _ = CASES[method]
+    if chunksize:
+        frame = cd.DataFrame(data_path, chunksize=chunksize, cache=False)
+    else:
+        frame = cd.DataFrame(df=pd.read_pickle(data_path))
+    #some methods print their results
+    with contextlib.redirect_stdout(io.StringIO()):
+        if setup is not None:
+            setup(frame)
+        start = time.perf_counter()
+        call(frame)
+        wall = time.perf_counter() - start
+    print(json.dumps({"wall": wall, "peak_rss_mb": peak_rss_mb()}))
+
+def measure(method, data_path, chunksize, repeat, workdir):
+    runs = []
+    for _ in range(repeat):
+        command = [sys.executable, os.path.abspath(__file__), "--worker", method, data_path]
+        if chunksize:
+            command += ["--chunksize", str(chunksize)]
+        process = subprocess.run(command, cwd=workdir, capture_output=True, text=True)
+        if process.returncode != 0:
+            return {"error": process.stderr.strip().splitlines()[-1] if process.stderr.strip() else "failed"}
+        runs.append(json.loads(process.stdout.strip().splitlines()[-1]))
+
+    rss = [run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None]
+    return {
+        "wall": statistics.median(run["wall"] for run in runs),
+        "peak_rss_mb": statistics.median(rss) if rss else None,
+    }
+
+def compare(result, base, threshold, rss_threshold):
+    """
+    Returns the list of regressions of a result against its baseline.
+    """
+    if "error" in result or base is None or "error" in base:
+        return []
+    regressions = []
+    if result["wall"] > base["wall"] * (1 + threshold) and result["wall"] - base["wall"] > MIN_REGRESSION:
+        regressions.append("wall")
+    if (result["peak_rss_mb"] is not None and base.get("peak_rss_mb") is not None
+            and result["peak_rss_mb"] > base["peak_rss_mb"] * (1 + rss_threshold)):
+        regressions.append("rss")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--mix", type=synthetic.parse_mix, default=synthetic.DEFAULT_MIX)
+    parser.add_argument("--null-rate", type=float, default=0.02)
+    parser.add_argument("--duplicate-rate", type=float, default=0.01)
+    parser.add_argument("--outlier-rate", type=float, default=0.001)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunksize", type=int, help="stream the data from a CSV file in batches")
+    parser.add_argument("--methods", nargs="+", help="the methods to run, all of them by default")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", help="a results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed wall time growth")
+    parser.add_argument("--rss-threshold", type=float, default=0.2, help="allowed peak RSS growth")
+    parser.add_argument("--save-baseline", help="the file to save the results to")
+    parser.add_argument("--worker", nargs=2, metavar=("METHOD", "DATA"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(*args.worker, args.chunksize)
+        return
+
+    missing = sorted(set(public_methods()) - set(CASES))
+    if missing:
+        print(f"Not benchmarked: {', '.join(missing)}")
+
+    config = {
+        "rows": args.rows, "mix": args.mix, "null_rate": args.null_rate, "duplicate_rate": args.duplicate_rate,
+        "outlier_rate": args.outlier_rate, "seed": args.seed, "chunksize": args.chunksize,
+    }
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        if baseline["config"] != config:
+            parser.error(f"The baseline was recorded with a different configuration: {baseline['config']}")
+
+    methods = args.methods or [name for name, case in CASES.items() if case[2] or not args.chunksize]
+    #the methods write their files to the working directory
+    workdir = tempfile.mkdtemp()
+    kwargs = {key: config[key] for key in ("mix", "null_rate", "duplicate_rate", "outlier_rate")}
+    if args.chunksize:
+        data_path = os.path.join(workdir, "data.csv")
+        synthetic.write_csv(data_path, args.rows, seed=args.seed, **kwargs)
+    else:
+        data_path = os.path.join(workdir, "data.pkl")
+        synthetic.make_frame(args.rows, seed=args.seed, **kwargs).to_pickle(data_path)
+
+    results = {}
+    regressed = False
+    print(f"{'method':<28}{'wall s':>10}{'peak MB':>10}{'rows/s':>14}{'vs base':>10}  status")
+    for method in methods:
+        result = measure(method, data_path, args.chunksize, args.repeat, workdir)
+        results[method] = result
+        if "error" in result:
+            print(f"{method:<28}{'':>44}  ERROR {result['error']}")
+            continue
+
+        base = baseline["results"].get(method) if baseline else None
+        regressions = compare(result, base, args.threshold, args.rss_threshold)
+        regressed |= bool(regressions)
+        change = f"{result['wall'] / base['wall'] - 1:+.0%}" if base and "wall" in base and base["wall"] > 0 else ""
+        rss = f"{result['peak_rss_mb']:.0f}" if result["peak_rss_mb"] is not None else "-"
+        status = f"REGRESSION ({', '.join(regressions)})" if regressions else "ok"
+        print(f"{method:<28}{result['wall']:>10.4f}{rss:>10}{args.rows / max(result['wall'], 1e-9):>14,.0f}{change:>10}  {status}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({"config": config, "results": results}, f, indent=4)
+
+    sys.exit(1 if regressed else 0)
+
+if __name__ == "__main__":
+    main()
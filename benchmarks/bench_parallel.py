@@ -0,0 +1,77 @@
+"""
+Benchmarks the serial and parallel per-column paths of cleanData.DataFrame.
+
+For an increasing number of columns, the script times remove_formatting,
+categorical_to_numeric, fill_missing_values and detect_outliers with no executor,
+with threads and with processes, checks that every parallel result is identical to
+the serial one and prints the speedups.
+
+Usage
+-----
+python benchmarks/bench_parallel.py --rows 200000 --columns 10 50 100 300 --workers 8
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import cleanData as cd
+
+METHODS = ("remove_formatting", "categorical_to_numeric", "fill_missing_values", "detect_outliers")
+
+def make_frame(rows, columns, seed=0):
+    """
+    Builds a frame with a third of numeric, money-like and categorical columns, with
+    missing values in the numeric columns.
+    """
+    rng = np.random.default_rng(seed)
+    categories = np.array(["North Region", "South Region", "East", "West", "Central Hub"], dtype=object)
+    data = {}
+    for i in range(columns):
+        kind = i % 3
+        if kind == 0:
+            values = rng.normal(size=rows)
+            values[rng.random(rows) < 0.01] = np.nan
+            data[f"num_{i}"] = values
+        elif kind == 1:
+            values = rng.integers(100_000, 1_000_000_000, size=rows) / 100
+            data[f"money_{i}"] = pd.Series([f"{value:,.2f}" for value in values], dtype=object)
+        else:
+            data[f"cat_{i}"] = pd.Series(rng.choice(categories, size=rows), dtype=object)
+    return pd.DataFrame(data)
+
+def run(frame, method, executor, workers):
+    df = cd.DataFrame(df=frame.copy(), executor=executor, n_workers=workers)
+    #every column gets a fill method, the text columns are left unchanged
+    args = ({col: "median" for col in frame.columns},) if method == "fill_missing_values" else ()
+    start = time.perf_counter()
+    result = getattr(df, method)(*args)
+    elapsed = time.perf_counter() - start
+    return elapsed, result if method == "detect_outliers" else df.df
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--columns", type=int, nargs="+", default=[10, 50, 100, 300])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    print(f"{'method':<24}{'columns':>8}{'serial s':>10}{'thread s':>10}{'process s':>11}{'thread x':>10}{'process x':>11}")
+    for columns in args.columns:
+        frame = make_frame(args.rows, columns)
+        for method in METHODS:
+            serial, expected = run(frame, method, None, args.workers)
+            timings = []
+            for executor in ("thread", "process"):
+                elapsed, result = run(frame, method, executor, args.workers)
+                pd.testing.assert_frame_equal(result, expected)
+                timings.append(elapsed)
+            print(f"{method:<24}{columns:>8}{serial:>10.3f}{timings[0]:>10.3f}{timings[1]:>11.3f}"
+                  f"{serial / timings[0]:>10.2f}{serial / timings[1]:>11.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmarks the start-up cost of the project against a time budget.
+
+Two things are measured, each in fresh interpreters:
+- import: the time of `import cleanData`.
+- first paint: the time from the start of `import main` until the Tk window has been
+  built and drawn once (skipped when no display is available).
+
+The median of the runs is compared with the budgets and the script exits with status 1
+if one of them is exceeded, so it can guard against regressions in CI.
+
+Usage
+-----
+python benchmarks/bench_startup.py --runs 5 --import-budget 1.0 --paint-budget 0.5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import cleanData
+print(time.perf_counter() - start)
+"""
+
+PAINT_SCRIPT = """
+import time
+start = time.perf_counter()
+import tkinter as tk
+import main
+try:
+    root = tk.Tk()
+except tk.TclError:
+    print("nan")
+    raise SystemExit
+app = main.DataCleaningAssistant(root)
+root.update()
+print(time.perf_counter() - start)
+root.destroy()
+"""
+
+def measure(script, runs):
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget", type=float, default=1.0, help="seconds")
+    parser.add_argument("--paint-budget", type=float, default=0.5, help="seconds")
+    args = parser.parse_args()
+
+    over_budget = False
+    for name, script, budget in (("import cleanData", IMPORT_SCRIPT, args.import_budget),
+                                 ("GUI first paint", PAINT_SCRIPT, args.paint_budget)):
+        elapsed = measure(script, args.runs)
+        if elapsed != elapsed:
+            print(f"{name:<18} skipped (no display)")
+            continue
+        status = "ok" if elapsed <= budget else "OVER BUDGET"
+        over_budget |= elapsed > budget
+        print(f"{name:<18} {elapsed:8.3f} s  (budget {budget:.3f} s)  {status}")
+
+    sys.exit(1 if over_budget else 0)
+
+if __name__ == "__main__":
+    main()
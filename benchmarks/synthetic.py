@@ -0,0 +1,136 @@
+"""
+Generates synthetic datasets for the benchmarks.
+
+The datasets mix numeric, date, currency and categorical columns, with a controlled
+rate of missing values, duplicate rows and outliers. Large datasets are generated
+chunk by chunk, so 1e8 rows can be written to disk without being held in memory.
+
+Usage
+-----
+python benchmarks/synthetic.py data.csv --rows 10000000 --null-rate 0.02 --duplicate-rate 0.01
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+COLUMN_KINDS = ("numeric", "date", "currency", "category")
+DEFAULT_MIX = {"numeric": 2, "date": 1, "currency": 1, "category": 2}
+CATEGORIES = np.array(["North Region", "South Region", "East", "West", "Central Hub",
+                       "Online", "Partner", "Wholesale"], dtype=object)
+CHUNK_ROWS = 1_000_000
+
+def make_frame(rows, mix=None, null_rate=0.02, duplicate_rate=0.01, outlier_rate=0.001, seed=0):
+    """
+    Builds a synthetic DataFrame.
+
+    Parameters
+    ----------
+    rows : int
+        The number of rows.
+    mix : dict, optional
+        The number of columns of each kind in COLUMN_KINDS:
+        'numeric' - normally distributed floats.
+        'date' - dates formatted as "%Y-%m-%d" strings.
+        'currency' - amounts formatted as "$1,234.56" strings.
+        'category' - labels from CATEGORIES, with skewed frequencies.
+        The default is DEFAULT_MIX.
+    null_rate : float, optional
+        The fraction of missing values in every column. The default is 0.02.
+    duplicate_rate : float, optional
+        The fraction of rows that are copies of an earlier row. The default is 0.01.
+    outlier_rate : float, optional
+        The fraction of numeric values moved 10 standard deviations away from the
+        mean. The default is 0.001.
+    seed : int, optional
+        The seed of the generator. The default is 0.
+
+    Returns
+    -------
+    pd.DataFrame
+        The generated data.
+    """
+    rng = np.random.default_rng(seed)
+    mix = DEFAULT_MIX if mix is None else mix
+    weights = 1 / np.arange(1, len(CATEGORIES) + 1)
+    weights /= weights.sum()
+
+    data = {}
+    for kind in COLUMN_KINDS:
+        for i in range(mix.get(kind, 0)):
+            if kind == "numeric":
+                values = rng.normal(100, 15, size=rows)
+                outliers = rng.random(rows) < outlier_rate
+                values[outliers] = 100 + 150 * rng.choice([-1, 1], size=int(outliers.sum()))
+            elif kind == "date":
+                days = rng.integers(0, 3650, size=rows)
+                values = (np.datetime64("2015-01-01") + days).astype(str).astype(object)
+            elif kind == "currency":
+                amounts = rng.integers(0, 100_000_000, size=rows) / 100
+                values = np.array([f"${amount:,.2f}" for amount in amounts], dtype=object)
+            else:
+                values = rng.choice(CATEGORIES, size=rows, p=weights)
+            data[f"{kind}_{i}"] = values
+    frame = pd.DataFrame(data)
+
+    for col in frame.columns:
+        frame.loc[rng.random(rows) < null_rate, col] = np.nan
+
+    n_duplicates = int(rows * duplicate_rate)
+    if rows > 1 and n_duplicates:
+        targets = rng.choice(np.arange(1, rows), size=min(n_duplicates, rows - 1), replace=False)
+        sources = (rng.random(len(targets)) * targets).astype(np.int64)
+        for j in range(frame.shape[1]):
+            column = frame.iloc[:, j].to_numpy(copy=True)
+            column[targets] = column[sources]
+            frame.iloc[:, j] = column
+    return frame
+
+def iter_frames(rows, chunk_rows=CHUNK_ROWS, seed=0, **kwargs):
+    """
+    Yields a synthetic dataset of rows rows in chunks of at most chunk_rows rows.
+
+    Every chunk is generated by make_frame with its own seed; duplicate rows are copies
+    of earlier rows of the same chunk. The keyword arguments are passed to make_frame.
+    """
+    for i, start in enumerate(range(0, rows, chunk_rows)):
+        chunk = make_frame(min(chunk_rows, rows - start), seed=seed + i, **kwargs)
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        yield chunk
+
+def write_csv(path, rows, chunk_rows=CHUNK_ROWS, **kwargs):
+    """
+    Writes a synthetic dataset to a CSV file, one chunk at a time.
+    """
+    for i, chunk in enumerate(iter_frames(rows, chunk_rows, **kwargs)):
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+
+def parse_mix(text):
+    """
+    Parses a column mix such as "numeric=2,date=1,currency=1,category=2".
+    """
+    mix = {}
+    for item in text.split(","):
+        kind, _, count = item.partition("=")
+        if kind not in COLUMN_KINDS:
+            raise argparse.ArgumentTypeError(f"Invalid column kind {kind}")
+        mix[kind] = int(count)
+    return mix
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX)
+    parser.add_argument("--null-rate", type=float, default=0.02)
+    parser.add_argument("--duplicate-rate", type=float, default=0.01)
+    parser.add_argument("--outlier-rate", type=float, default=0.001)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    write_csv(args.path, args.rows, args.chunk_rows, seed=args.seed, mix=args.mix, null_rate=args.null_rate,
+              duplicate_rate=args.duplicate_rate, outlier_rate=args.outlier_rate)
+
+if __name__ == "__main__":
+    main()
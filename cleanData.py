@@ -1,17 +1,477 @@
 import json
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
-from sklearn.preprocessing import LabelEncoder, OneHotEncoder
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LogisticRegression, LinearRegression
+import functools
+import importlib.util
 import math
-from dateutil.parser import parse
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from correlation import BLOCK_SIZE as CORRELATION_BLOCK_SIZE, correlate
+from statistics import NormalDist
+from loadCache import LoadCache, cache_enabled
+from rowHashing import canonical_rows
+from runningStats import RunningStats
+from sketches import HLL_PRECISION, KLL_K, TOP_K, FrameSketch
+from sqlSource import read_sql
+from tracing import instrument
+from nearDuplicates import NGRAM, NUM_PERM, THRESHOLD, find_near_duplicates
+from typeInference import SAMPLE_SIZE, convert_column, infer_column_type, is_text
 
+FILE_FORMATS = ("csv", "json", "jsonl", "xlsx", "parquet", "sql")
+#the formats whose first rows are read without parsing the whole file
+INCREMENTAL_FORMATS = ("csv", "jsonl", "xlsx", "parquet")
+#read_json and read_excel read a boolean column with missing values as float
+MISSING_BOOL_DTYPES = {"jsonl": np.dtype(np.float64), "xlsx": np.dtype(np.float64)}
+
+#the values inferred by pandas for a column that holds strings
+TEXT_VALUES = ("string", "mixed", "mixed-integer")
+
+def file_format(filepath):
+    """
+    Returns the format of a file based on its extension.
+
+    Parameters
+    ----------
+    filepath : str
+        The path to the file.
+
+    Raises
+    ------
+    ValueError
+        If the extension is not one of the supported formats.
+
+    Returns
+    -------
+    str
+        The file format, e.g. 'csv' or 'xlsx'.
+    """
+    extension = os.path.splitext(filepath)[1].lower().lstrip(".")
+    if extension not in FILE_FORMATS:
+        raise ValueError("Invalid file format")
+    return extension
+
+def read_file(filepath, chunksize=None, text_columns=()):
+    """
+    Reads a file into a pandas DataFrame or into an iterator of DataFrame batches.
+
+    CSV and JSON Lines files are read with the pandas chunked readers, Excel files are
+    streamed row by row through openpyxl in read-only mode and Parquet files are read
+    one record batch at a time. A plain JSON document cannot be parsed incrementally,
+    so it is loaded once and then split into batches.
+
+    Parameters
+    ----------
+    filepath : str
+        The path to the file containing the data.
+    chunksize : int, optional
+        The number of rows per batch. If None, the whole file is loaded. The default is None.
+    text_columns : list, optional
+        The columns of a CSV or JSON Lines file read as they are written in every batch,
+        without inferring numbers from them, see DataFrame.iter_batches. The default is ().
+
+    Returns
+    -------
+    pd.DataFrame or iterator of pd.DataFrame
+        The loaded data, or an iterator of batches when chunksize is given.
+    """
+    extension = file_format(filepath)
+    if chunksize is None:
+        if extension == "csv":
+            return pd.read_csv(filepath)
+        elif extension == "json":
+            return pd.read_json(filepath)
+        elif extension == "jsonl":
+            return pd.read_json(filepath, lines=True)
+        elif extension == "xlsx":
+            return pd.read_excel(filepath)
+        elif extension == "parquet":
+            return pd.read_parquet(filepath)
+        else:
+            raise ValueError("A .sql file holds a query, read it with DataFrame(filepath, connection_url=...)")
+
+    if chunksize <= 0:
+        raise ValueError("chunksize must be greater than 0")
+    if extension == "csv":
+        return pd.read_csv(filepath, chunksize=chunksize, dtype={col: str for col in text_columns} or None)
+    elif extension == "jsonl":
+        return pd.read_json(filepath, lines=True, chunksize=chunksize, dtype={col: object for col in text_columns} or True)
+    elif extension == "xlsx":
+        return _iter_excel(filepath, chunksize)
+    elif extension == "parquet":
+        return _iter_parquet(filepath, chunksize)
+    else:
+        return _iter_frame(read_file(filepath), chunksize)
+
+def _common_dtype(first, second):
+    """
+    Returns the dtype pandas gives when columns of the two dtypes are concatenated.
+    """
+    return pd.concat([pd.Series(dtype=first), pd.Series(dtype=second)]).dtype
+
+def batch_schema(batches, missing_bool=np.dtype(object)):
+    """
+    Returns the dtypes the columns of a file read in batches get when it is read whole.
+
+    The chunked readers infer the dtypes of every batch on its own: an integer column is
+    read as float in a batch with a missing value or where it is all missing, and a
+    column of numbers as text in a batch that holds a word. The dtype of a column is the
+    one pandas gives when its batches are concatenated, leaving out the batches where it
+    is all missing; an integer column with missing values becomes float and a boolean
+    one missing_bool, as in the whole-file readers.
+
+    Parameters
+    ----------
+    batches : iterable of pd.DataFrame
+        The batches of the file.
+    missing_bool : dtype, optional
+        The dtype of a boolean column with missing values. The default is object.
+
+    Returns
+    -------
+    dict
+        The dtype of each column.
+    dict
+        The dtype of the columns that hold strings in at least one batch, in the batches
+        that hold them.
+    """
+    first = {}
+    common = {}
+    text = {}
+    bools = set()
+    missing = set()
+    for batch in batches:
+        for col in batch.columns:
+            series = batch[col]
+            first.setdefault(col, series.dtype)
+            nulls = series.isna()
+            if nulls.any():
+                missing.add(col)
+            if nulls.all():
+                continue
+            values = pd.api.types.infer_dtype(series, skipna=True)
+            if values == "boolean":
+                bools.add(col)
+                continue
+            if is_text(series) and values in TEXT_VALUES:
+                text[col] = series.dtype if col not in text else _common_dtype(text[col], series.dtype)
+            common[col] = series.dtype if col not in common else _common_dtype(common[col], series.dtype)
+
+    dtypes = {}
+    for col, dtype in first.items():
+        dtype = common.get(col)
+        if col in bools:
+            bool_dtype = missing_bool if col in missing else np.dtype(bool)
+            dtype = bool_dtype if dtype is None else _common_dtype(dtype, bool_dtype)
+        if dtype is None:
+            dtype = first[col]
+        if col in missing and isinstance(dtype, np.dtype) and dtype.kind in "iu":
+            dtype = np.dtype(np.float64)
+        dtypes[col] = dtype
+    return dtypes, text
+
+def _iter_frame(df, chunksize):
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+def _excel_batch(rows, header):
+    df = pd.DataFrame(rows, columns=header)
+    #openpyxl gives None for empty cells, read_excel gives NaN
+    for j, dtype in enumerate(df.dtypes):
+        if dtype == object:
+            column = df.iloc[:, j]
+            df.iloc[:, j] = column.where(column.notna(), np.nan)
+    return df
+
+def _iter_excel(filepath, chunksize):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == chunksize:
+                yield _excel_batch(batch, header)
+                batch = []
+        if batch:
+            yield _excel_batch(batch, header)
+    finally:
+        workbook.close()
+
+def _iter_parquet(filepath, chunksize):
+    import pyarrow.parquet as pq
+
+    for record_batch in pq.ParquetFile(filepath).iter_batches(batch_size=chunksize):
+        yield record_batch.to_pandas()
+
+#checked without importing pyarrow, which is only loaded when a column is converted
+STRING_DTYPE = "string[pyarrow]" if importlib.util.find_spec("pyarrow") else "string"
+
+DEDUP_PARTITIONS = 64
+
+def _partition_duplicates(path):
+    """
+    Returns the index labels of the duplicate rows of a partition file.
+    """
+    pieces = []
+    with open(path, "rb") as f:
+        while True:
+            try:
+                pieces.append(pickle.load(f))
+            except EOFError:
+                break
+    if not pieces:
+        return np.empty(0, dtype=np.int64)
+    partition = pd.concat(pieces)
+    return partition.index[partition.duplicated()].to_numpy(dtype=np.int64)
+
+def _isin_sorted(labels, sorted_values):
+    """
+    Checks which labels are in a sorted array, in O(len(labels) * log(len(sorted_values))).
+    """
+    if len(sorted_values) == 0:
+        return np.zeros(len(labels), dtype=bool)
+    positions = np.minimum(np.searchsorted(sorted_values, labels), len(sorted_values) - 1)
+    return sorted_values[positions] == np.asarray(labels)
+
+EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+def _remove_column_formatting(series, formats, sample_size):
+    """
+    Returns the column with its formatting removed and the type specification that was
+    applied, see DataFrame.remove_formatting.
+    """
+    spec = formats.get(str(series.name))
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        #a compacted column is converted through its categories only
+        categories = pd.Series(series.cat.categories, name=series.name)
+        if spec is None:
+            spec = infer_column_type(categories, sample_size)
+        converted, spec = convert_column(categories, spec)
+        values = converted.array.take(series.cat.codes.to_numpy(), allow_fill=True)
+        return pd.Series(values, index=series.index, name=series.name), spec
+
+    if spec is None:
+        spec = infer_column_type(series, sample_size)
+    return convert_column(series, spec)
+
+def _fill_column(series, methods):
+    """
+    Returns the column with its missing values filled with its method, see
+    DataFrame.fill_column_missing_values, or None if it is left unchanged.
+    """
+    method = methods[series.name]
+    if _is_label(series):
+        return None
+    if method == "mean":
+        value = series.mean()
+    elif method == "median":
+        value = series.median()
+    elif method == "fill":
+        value = "NA"
+        series = series.astype(object)
+    elif method == "zero":
+        value = 0
+    else:
+        return None
+
+    #compacted integer columns cannot hold a fractional fill value
+    if pd.api.types.is_integer_dtype(series) and isinstance(value, float) and not value.is_integer():
+        series = series.astype(float)
+    return series.fillna(value)
+
+UNSEEN_CODE = -1
+
+BOOL_CATEGORIES = np.array([False, True])
+
+def _encode_column(series, encodings):
+    """
+    Returns the encoded column and its categories, see DataFrame.categorical_to_numeric.
+    """
+    if series.dtype == 'bool':
+        return series.astype(np.int64), BOOL_CATEGORIES
+
+    categories = encodings.get(series.name)
+    if categories is None:
+        #a single hash pass; only the distinct values are sorted
+        codes, categories = pd.factorize(series, sort=True)
+        categories = np.asarray(categories)
+    else:
+        codes = pd.Index(categories).get_indexer(series)
+    return pd.Series(codes.astype(np.int64), index=series.index, name=series.name), categories
+
+#the types of the values of mixed categories that are saved as text with their type
+CATEGORY_TYPES = {"str": str, "int": int, "float": float, "bool": lambda text: text == "True"}
+
+def _category_type(value):
+    if isinstance(value, (bool, np.bool_)):
+        return "bool"
+    if isinstance(value, (int, np.integer)):
+        return "int"
+    if isinstance(value, (float, np.floating)):
+        return "float"
+    if isinstance(value, str):
+        return "str"
+    raise ValueError(f"The category {value!r} of type {type(value).__name__} cannot be saved")
+
+def _is_label(series):
+    """
+    Checks if a column holds labels, i.e. text or categories.
+    """
+    return is_text(series) or isinstance(series.dtype, pd.CategoricalDtype)
+
+def _compact_column(series, category_threshold):
+    """
+    Returns the column stored in the smallest dtype that keeps every value, see DataFrame.compact.
+    """
+    if pd.api.types.is_bool_dtype(series):
+        return series
+
+    if pd.api.types.is_integer_dtype(series):
+        if series.isna().all():
+            #no value to size the dtype on, and min() would be NA
+            return series.astype("Int8") if isinstance(series.dtype, pd.api.extensions.ExtensionDtype) else series
+        return pd.to_numeric(series, downcast="unsigned" if series.min() >= 0 else "integer")
+
+    if pd.api.types.is_float_dtype(series):
+        values = series.dropna()
+        if len(values) and (values % 1 == 0).all() and values.abs().max() < 2**53:
+            #whole numbers with missing values fit a nullable integer
+            return _compact_column(series.astype("Int64"), category_threshold)
+        compacted = series.astype(np.float32)
+        if ((compacted.astype(series.dtype) == series) | series.isna()).all():
+            return compacted
+        return series
+
+    if is_text(series) and len(series):
+        if series.nunique() <= category_threshold * len(series):
+            return series.astype("category")
+        if pd.api.types.infer_dtype(series, skipna=True) == "string":
+            return series.astype(STRING_DTYPE)
+
+    return series
+
+def _lossless_cast(series, dtype):
+    """
+    Returns the column cast to dtype, or None if the cast would change a value, e.g. a
+    value that is not one of the categories or an integer out of a compacted dtype.
+    """
+    try:
+        cast = series.astype(dtype)
+        if cast.astype(series.dtype).equals(series):
+            return cast
+    except (TypeError, ValueError, OverflowError):
+        pass
+    return None
+
+def _widened_dtype(history, values):
+    """
+    Returns a dtype of the history column that holds the new values as well.
+    """
+    if isinstance(history.dtype, pd.CategoricalDtype):
+        unseen = pd.Index(values.dropna().unique()).difference(history.cat.categories)
+        try:
+            return history.cat.add_categories(unseen).dtype
+        except (TypeError, ValueError):
+            return np.dtype(object)
+    #the dtype pandas gives when the columns are concatenated
+    return pd.concat([history.iloc[:0], values.iloc[:0]]).dtype
+
+def _sketch_batch(batch, k, precision, top_k):
+    """
+    Returns the FrameSketch of a batch, see DataFrame.get_sketch.
+    """
+    sketch = FrameSketch(k, precision, top_k)
+    sketch.update(batch)
+    return sketch
+
+@functools.lru_cache(maxsize=None)
+def _z_value(confidence_level):
+    """
+    Returns the two-sided critical value of the standard normal distribution.
+    """
+    return NormalDist().inv_cdf(1 - (1 - confidence_level) / 2)
+
+def _wilson_interval(successes, n, z):
+    """
+    Returns the Wilson score interval (lower, upper) of the proportions successes / n.
+    """
+    p = successes / n
+    denominator = 1 + z**2 / n
+    center = (p + z**2 / (2 * n)) / denominator
+    half_width = z * np.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / denominator
+    return np.clip(center - half_width, 0, 1), np.clip(center + half_width, 0, 1)
+
+PROFILE_PARTS = {
+    "missing": lambda profile: profile.df.isnull().sum(),
+    "amount_missing": lambda profile: int(profile["missing"].sum()),
+    "columns_missing": lambda profile: list(profile["missing"].index[profile["missing"] > 0]),
+    "duplicates": lambda profile: profile.df.duplicated(),
+    "amount_duplicates": lambda profile: int(profile["duplicates"].sum()),
+    "dtypes": lambda profile: profile.df.dtypes,
+    "memory": lambda profile: profile.df.memory_usage(deep=True),
+    "stats": lambda profile: profile.df.describe(include='all') if len(profile.df.columns) else pd.DataFrame(),
+}
+
+class _Profile(dict):
+    """
+    The profile of a DataFrame, see DataFrame.get_profile. Each part is computed on its
+    first access.
+    """
+    def __init__(self, df):
+        super().__init__()
+        self.df = df
+
+    def __missing__(self, key):
+        if key not in PROFILE_PARTS:
+            raise KeyError(key)
+        value = self[key] = PROFILE_PARTS[key](self)
+        return value
+
+    def __iter__(self):
+        return iter(PROFILE_PARTS)
+
+    def __len__(self):
+        return len(PROFILE_PARTS)
+
+    def keys(self):
+        return PROFILE_PARTS.keys()
+
+    def items(self):
+        return [(key, self[key]) for key in PROFILE_PARTS]
+
+    def values(self):
+        return [self[key] for key in PROFILE_PARTS]
+
+OUTLIER_THRESHOLDS = {"zscore": 3.0, "iqr": 1.5}
+
+def _outlier_bounds(series, method, threshold):
+    """
+    Returns the (lower, upper) bounds outside of which a value is an outlier.
+    """
+    if method == "zscore":
+        mean = series.mean()
+        std = series.std(ddof=0)
+        if not std > 0:
+            return -np.inf, np.inf
+        return mean - threshold * std, mean + threshold * std
+
+    q1, q3 = series.quantile([0.25, 0.75])
+    iqr = q3 - q1
+    return q1 - threshold * iqr, q3 + threshold * iqr
+
+@instrument
 class DataFrame:
-    def __init__(self, filepath: str = None, df: pd.DataFrame = None):
+    def __init__(self, filepath: str = None, df: pd.DataFrame = None, chunksize: int = None,
+                 executor: str = None, n_workers: int = None, compact: bool = False, cache=True,
+                 connection_url: str = None, table: str = None, query: str = None,
+                 columns: list = None, filters: list = None, tracer=None):
         """
         __init__ constructor for DataFrame class.
 
@@ -21,37 +481,398 @@ class DataFrame:
             The path to the file containing the data. The default is None.
         df : pd.DataFrame, optional
             The DataFrame containing the data. The default is None.
+        chunksize : int, optional
+            If given together with filepath, the file is not loaded into memory. The data
+            is instead streamed in batches of chunksize rows (see iter_batches) and the
+            methods that support streaming process it batch by batch; the other methods
+            raise a ValueError until load() is called. The default is None.
+        executor : str, optional
+            'thread' or 'process' to run the per-column work of remove_formatting,
+            categorical_to_numeric, fill_missing_values and detect_outliers in parallel.
+            The results are identical to the serial path. get_correlation always uses
+            threads. The default is None (serial).
+        n_workers : int, optional
+            The number of parallel workers. The default is None (one per CPU).
+        compact : bool, optional
+            If True, the in-memory data is compacted with compact() on load and again
+            after remove_formatting. The default is False.
+        cache : bool or LoadCache, optional
+            Whether a file goes through the on-disk load cache, which keeps the parsed
+            data of a file in a columnar format so that opening it again skips the parsing
+            (see loadCache.LoadCache). A cached file is streamed from its cache entry, and
+            a streamed file is cached when it is loaded with load(). A LoadCache can be given to use
+            another directory or size cap. The cache can also be turned off for every
+            load with the DCA_CACHE=0 environment variable. The default is True.
+        connection_url : str, optional
+            A database connection URL (SQLAlchemy format, e.g. "sqlite:///data.db") to read
+            the data from instead of a file. The data is the given table or query, or the
+            query in filepath if it is a .sql file. Connections are pooled across loads and
+            with a chunksize the rows are streamed through a server-side cursor.
+            The default is None.
+        table : str, optional
+            The table to read from the database. The default is None.
+        query : str, optional
+            The query to read from the database. The default is None.
+        columns : list, optional
+            The columns to select in the database. The default is None (all columns).
+        filters : list, optional
+            Conditions evaluated by the database, as (column, operator, value) tuples
+            combined with AND; see sqlSource.build_query. The default is None.
+        tracer : tracing.Tracer, optional
+            A tracer recording the calls of the methods (time, CPU, memory and shape of
+            the data). The default is None.
 
         Raises
         ------
         ValueError
-            If both filepath and df are provided or neither is provided.
+            If both filepath and df are provided or neither is provided, if the
+            executor is not supported, or if the database source is incomplete.
 
         Returns
         -------
         None
         """
-        if df is not None and filepath is None:
+        if executor is not None and executor not in EXECUTORS:
+            raise ValueError("Invalid executor, expected 'thread' or 'process'")
+
+        self.filepath = filepath
+        self.chunksize = chunksize
+        self.executor = executor
+        self.n_workers = n_workers
+        self.compact_dtypes = compact
+        self.tracer = tracer
+        self.compaction_report = None
+        self._batch_transforms = []
+        self._source = None
+        self._schema = None
+        self._format = None
+        self._cache = None
+        self._profile = None
+        self._profile_df = None
+        self._running = None
+        self._df = None
+        self._df_batches = []
+        self.outliers = None
+        self.outlier_bounds = None
+        self.outlier_method = None
+        self.column_formats = {}
+        self.encodings = {}
+
+        if connection_url is not None and df is None:
+            if filepath is not None:
+                if file_format(filepath) != "sql":
+                    raise ValueError("Only a .sql file can be read with a connection_url")
+                with open(filepath, "r") as f:
+                    query = f.read()
+            self._source = lambda size, text_columns=(): read_sql(connection_url, table, query, columns, filters, size)
+            self.df = self._source(None) if chunksize is None else None
+
+        elif df is not None and filepath is None:
             self.df = df
         
         elif filepath is not None and df is None:
-            temp_filepath = filepath.split(".")
-            if temp_filepath[1] == "csv":
-                self.df = pd.read_csv(filepath)
-            elif temp_filepath[1] == "json":
-                self.df = pd.read_json(filepath)
-            elif temp_filepath[1] == "xlsx":
-                self.df = pd.read_excel(filepath)
-            elif temp_filepath[1] == "parquet":
-                self.df = pd.read_parquet(filepath)
-            elif temp_filepath[1] == "sql":
-                self.df = pd.read_sql(filepath)
+            self._source = lambda size, text_columns=(): read_file(filepath, size, text_columns)
+            self._format = file_format(filepath)
+            if cache and cache_enabled() and self._format != "sql":
+                self._cache = cache if isinstance(cache, LoadCache) else LoadCache()
+            if chunksize is None:
+                self.df = self._cache.load(filepath, read_file) if self._cache is not None else read_file(filepath)
             else:
-                raise ValueError("Invalid file format")
+                if self._cache is not None:
+                    #a cached file is streamed from its cache entry
+                    self._source = lambda size, text_columns=(): \
+                        self._cache.read_batches(filepath, size) or read_file(filepath, size, text_columns)
+                self.df = None
             
         else:
             raise ValueError("Either filepath or df must be provided, not both")
 
+        if compact and not self.streaming:
+            self.compact()
+
+    @property
+    def df(self):
+        """
+        The data held in memory, None while it is streamed. The batches added by append
+        are kept apart and only concatenated when the data is read.
+        """
+        if self._df_batches:
+            self._df = pd.concat([self._df, *self._df_batches])
+            self._df_batches = []
+        return self._df
+
+    @df.setter
+    def df(self, df):
+        self._df = df
+        self._df_batches = []
+
+    @property
+    def outliers(self):
+        """
+        The boolean mask of the outliers found by detect_outliers, None before it is run.
+        The flags of the rows added by append are concatenated when the mask is read.
+        """
+        if self._outlier_batches:
+            self._outliers = pd.concat([self._outliers, *self._outlier_batches])
+            self._outlier_batches = []
+        return self._outliers
+
+    @outliers.setter
+    def outliers(self, outliers):
+        self._outliers = outliers
+        self._outlier_batches = []
+
+    @property
+    def shape(self):
+        """
+        The number of rows and columns of the data, (None, None) while it is streamed.
+        The batches added by append are counted without being concatenated.
+        """
+        if self.streaming:
+            return (None, None)
+        return (len(self._df) + sum(len(batch) for batch in self._df_batches), self._df.shape[1])
+
+    @property
+    def streaming(self):
+        """
+        True if the data is streamed from its source in batches instead of held in memory.
+        """
+        return self._df is None
+
+    def _check_in_memory(self, method):
+        #the methods without a streaming path need the whole data
+        if self.streaming:
+            raise ValueError(f"{method} needs the data in memory, call load() first")
+
+    def iter_batches(self):
+        """
+        Iterates over the data in batches of at most chunksize rows.
+
+        In streaming mode every batch is read from the source and the pending
+        batch transforms (e.g. remove_NaN) are applied to it, so only one batch is
+        held in memory at a time. Batches carry the row positions of the source file
+        as their index, the same index the in-memory path would produce. Their dtypes
+        are the ones the whole data would have, found by a first pass over the source
+        on the first call (see batch_schema), so every batch has the same dtypes.
+
+        Yields
+        ------
+        pd.DataFrame
+            The next batch of rows.
+        """
+        if not self.streaming:
+            yield from _iter_frame(self.df, self.chunksize or max(len(self.df), 1))
+            return
+
+        if self._schema is None:
+            self._schema = self._read_schema()
+        dtypes, text_columns = self._schema
+
+        start = 0
+        for batch in self._source(self.chunksize, text_columns):
+            changed = {col: dtype for col, dtype in dtypes.items() if col in batch.columns and batch[col].dtype != dtype}
+            if changed:
+                batch = batch.astype(changed)
+            batch.index = pd.RangeIndex(start, start + len(batch))
+            start += len(batch)
+            for transform in self._batch_transforms:
+                batch = transform(batch)
+            yield batch
+
+    def _read_schema(self):
+        """
+        Returns the dtypes of the whole data and the columns read as written, from a first
+        pass over the source, see batch_schema.
+        """
+        dtypes, text = batch_schema(self._source(self.chunksize), MISSING_BOOL_DTYPES.get(self._format, np.dtype(object)))
+        if self._format == "csv":
+            #every value is parsed from text, so a column with text in one batch is text
+            #in the whole file, its numbers included
+            dtypes.update(text)
+            return dtypes, list(text)
+        if self._format == "jsonl" and text:
+            #read_json turns strings that look like numbers into numbers batch by batch;
+            #the text columns are read as written, and are strings if all their values are
+            strings = dict.fromkeys(text, True)
+            for batch in self._source(self.chunksize, list(text)):
+                for col in text:
+                    strings[col] = strings[col] and pd.api.types.infer_dtype(batch[col], skipna=True) in ("string", "empty")
+            for col in text:
+                dtypes[col] = pd.Series([""]).dtype if strings[col] else np.dtype(object)
+            return dtypes, list(text)
+        return dtypes, []
+
+    def load(self, on_batch=None):
+        """
+        Materializes a streamed DataFrame in memory, applying the pending batch transforms.
+
+        A file read with no pending batch transform is then cached, see the cache
+        parameter of the constructor.
+
+        Parameters
+        ----------
+        on_batch : callable, optional
+            Called with each batch as it is read, e.g. to report the progress.
+            The default is None.
+
+        Returns
+        -------
+        pd.DataFrame
+            The loaded data.
+        """
+        if self.streaming:
+            batches = []
+            for batch in self.iter_batches():
+                batches.append(batch)
+                if on_batch is not None:
+                    on_batch(batch)
+            df = pd.concat(batches) if batches else pd.DataFrame()
+            if self._cache is not None and not self._batch_transforms:
+                self._cache.store(self.filepath, df)
+            self.df = df
+            self._batch_transforms = []
+            self._invalidate_profile()
+        return self.df
+
+    def _map_columns(self, func, columns, *args):
+        """
+        Applies func(self.df[col], *args) to each column, in parallel if an executor is set.
+
+        Returns
+        -------
+        list
+            The results in the order of columns.
+        """
+        series = [self.df[col] for col in columns]
+        if self.executor is None or len(series) < 2:
+            return [func(column, *args) for column in series]
+
+        with EXECUTORS[self.executor](max_workers=self.n_workers) as pool:
+            return list(pool.map(func, series, *[[arg] * len(series) for arg in args]))
+
+    def get_profile(self):
+        """
+        Returns the profile of the DataFrame, computing each part only when needed.
+
+        The profile gathers missing values, duplicate rows, data types, memory usage and
+        general statistics. Each part is computed on its first access and kept: the null
+        mask and the duplicate mask are each computed once and every count is derived
+        from them, while the statistics and the memory usage, which scan every value,
+        are only computed when asked for. The profile is cached on the object and
+        invalidated by the methods that modify the data, so repeated report calls are free.
+
+        Returns
+        -------
+        dict
+            A dictionary with the keys 'missing', 'amount_missing', 'columns_missing',
+            'duplicates', 'amount_duplicates', 'dtypes', 'memory' and 'stats'.
+        """
+        self._check_in_memory("get_profile")
+        if self._profile is None or self._profile_df is not self.df:
+            self._profile = _Profile(self.df)
+            self._profile_df = self.df
+        return self._profile
+
+    def _invalidate_profile(self):
+        self._profile = None
+        self._profile_df = None
+        self._running = None
+
+    def append(self, batch, drop_duplicates=False):
+        """
+        Appends new rows, cleaning only them and updating the statistics incrementally.
+
+        On the first call the running statistics (see runningStats.RunningStats) are built
+        from the current data; from then on every call costs time proportional to the
+        batch: the batch is formatted with the known column formats, its rows are hashed
+        against the rows seen so far, and the null counters and the running mean and
+        variance of the numerical columns are updated. get_amount_duplicates,
+        get_missing_value and z-score detect_outliers then read the running statistics
+        instead of scanning the whole data. Methods that modify the data otherwise drop
+        the running statistics, which are rebuilt on the next append. The appended
+        batches are only concatenated to the data when it is read (see df).
+
+        The new values take the dtypes of the data when no value changes, otherwise the
+        column of the data is widened to hold them, e.g. a category is added or a
+        compacted integer column is widened.
+
+        If outliers were detected, the new rows are flagged against the current bounds,
+        updated from the running statistics for the z-score method; earlier rows keep
+        their flags until detect_outliers is run again.
+
+        Parameters
+        ----------
+        batch : pd.DataFrame
+            The new rows, with the columns of the DataFrame.
+        drop_duplicates : bool, optional
+            If True, the new rows that repeat an earlier row are not appended.
+            The default is False.
+
+        Raises
+        ------
+        ValueError
+            If the DataFrame is streamed.
+
+        Returns
+        -------
+        pd.DataFrame
+            The cleaned new rows, as appended.
+        """
+        if self.streaming:
+            raise ValueError("Rows can only be appended to an in-memory DataFrame, call load() first")
+
+        batch = batch.copy()
+        for col in batch.columns:
+            spec = self.column_formats.get(str(col))
+            if spec is not None and _is_label(batch[col]):
+                batch[col] = _remove_column_formatting(batch[col], {str(col): spec}, SAMPLE_SIZE)[0]
+        for col, dtype in self._df.dtypes.items():
+            if col in batch.columns and batch[col].dtype != dtype:
+                cast = _lossless_cast(batch[col], dtype)
+                if cast is None:
+                    df = self.df.copy(deep=False)
+                    df[col] = df[col].astype(_widened_dtype(df[col], batch[col]))
+                    self.df = df
+                    cast = _lossless_cast(batch[col], df[col].dtype)
+                #RunningStats hashes the rows in canonical dtypes, so equal rows match even
+                #when the column keeps a dtype of its own
+                if cast is not None:
+                    batch[col] = cast
+
+        if self._running is None:
+            running = RunningStats()
+            running.update(self.df)
+        else:
+            running = self._running
+        duplicated = running.duplicated(batch)
+        if drop_duplicates:
+            batch = batch[~duplicated]
+            duplicated = duplicated[~duplicated]
+        running.update(batch, duplicated)
+
+        rows = self.shape[0]
+        last = self._df_batches[-1] if self._df_batches else self._df
+        start = rows
+        if rows and pd.api.types.is_integer_dtype(last.index):
+            start = int(last.index.max()) + 1
+        batch.index = pd.RangeIndex(start, start + len(batch))
+
+        if self._outliers is not None:
+            columns = self._outliers.columns
+            if self.outlier_method is not None and self.outlier_method[0] == "zscore":
+                lower, upper = running.zscore_bounds(columns, self.outlier_method[1])
+                self.outlier_bounds = pd.DataFrame({"lower": lower, "upper": upper})
+            numeric = batch.reindex(columns=columns)
+            flags = (numeric.lt(self.outlier_bounds["lower"], axis=1) | numeric.gt(self.outlier_bounds["upper"], axis=1))
+            self._outlier_batches.append(flags.fillna(False).astype(bool))
+
+        if not rows:
+            self.df = batch
+        elif len(batch):
+            self._df_batches.append(batch)
+        self._running = running
+        return batch
+
     def get_duplicates(self):
         """
         Returns a boolean Series denoting duplicate rows.
@@ -62,7 +883,8 @@ class DataFrame:
             For each element in the DataFrame, True if the row is a duplicate and
             False otherwise.
         """
-        return self.df.duplicated()
+        self._check_in_memory("get_duplicates")
+        return self.get_profile()["duplicates"]
 
     def get_amount_duplicates(self):
         """
@@ -73,7 +895,94 @@ class DataFrame:
         int
             The number of duplicate rows in the DataFrame.
         """
-        return self.df.duplicated().sum()
+        if self.streaming:
+            return len(self._streaming_duplicates())
+        if self._running is not None:
+            return self._running.duplicates
+
+        return self.get_profile()["amount_duplicates"]
+
+    def _streaming_duplicates(self, subset=None, n_partitions=DEDUP_PARTITIONS, tmpdir=None):
+        """
+        Returns the sorted index labels of the duplicate rows of a streamed DataFrame.
+
+        Each batch is split by row hash into n_partitions spill files on disk, holding only
+        the compared columns. The batches are read with the dtypes of the whole data (see
+        iter_batches) and the columns are kept in canonical dtypes (see
+        rowHashing.canonical_rows), so equal rows hash the same in every batch. Equal rows
+        always land in the same partition, in stream order, so every partition can be
+        deduplicated on its own, in parallel if an executor is set, while keeping the first
+        occurrence. Only one partition is in memory per worker.
+        """
+        with tempfile.TemporaryDirectory(dir=tmpdir) as directory:
+            paths = [os.path.join(directory, f"partition{i}.pkl") for i in range(n_partitions)]
+            files = [open(path, "wb") for path in paths]
+            try:
+                for batch in self.iter_batches():
+                    #a batch transform may still leave a column with a dtype of its own
+                    keys = canonical_rows(batch if subset is None else batch[subset])
+                    partitions = pd.util.hash_pandas_object(keys, index=False).to_numpy() % np.uint64(n_partitions)
+                    for partition in np.unique(partitions):
+                        pickle.dump(keys[partitions == partition], files[partition])
+            finally:
+                for f in files:
+                    f.close()
+
+            if self.executor is None:
+                duplicates = [_partition_duplicates(path) for path in paths]
+            else:
+                with EXECUTORS[self.executor](max_workers=self.n_workers) as pool:
+                    duplicates = list(pool.map(_partition_duplicates, paths))
+
+        return np.sort(np.concatenate(duplicates))
+
+    def get_near_duplicates(self, columns=None, threshold=THRESHOLD, block_on=None, num_perm=NUM_PERM, ngram=NGRAM):
+        """
+        Returns clusters of near-duplicate rows.
+
+        The values of the key columns are joined and normalized (lower case, punctuation
+        removed) and each row gets a MinHash signature of its character n-grams. Candidate
+        pairs are the rows that share a locality sensitive hashing bucket, optionally
+        restricted to rows with the same blocking values, so no pairwise comparison of all
+        the rows is made and the cost grows close to linearly. Candidates whose estimated
+        Jaccard similarity reaches threshold are linked and the linked rows form clusters.
+        Rows whose key columns are all missing or empty are never clustered.
+        See nearDuplicates.find_near_duplicates.
+
+        Parameters
+        ----------
+        columns : list, optional
+            The key columns to be compared. The default is None (all columns).
+        threshold : float, optional
+            The minimum estimated similarity between two linked rows. The default is THRESHOLD.
+        block_on : str or list, optional
+            Blocking column(s); only rows with equal values in them are compared.
+            The default is None.
+        num_perm : int, optional
+            The MinHash signature length. The default is NUM_PERM.
+        ngram : int, optional
+            The length of the character n-grams. The default is NGRAM.
+
+        Returns
+        -------
+        pd.DataFrame
+            Indexed by the rows that belong to a cluster of two rows or more, with the
+            'cluster' of each row (the index of the first row of the cluster) and its
+            estimated 'similarity' to that first row.
+        """
+        self._check_in_memory("get_near_duplicates")
+        clusters = self._near_duplicate_positions(columns, threshold, block_on, num_perm, ngram)
+        return pd.DataFrame({
+            "cluster": self.df.index[clusters["cluster"]],
+            "similarity": clusters["similarity"].to_numpy(),
+        }, index=self.df.index[clusters["position"]])
+
+    def _near_duplicate_positions(self, columns, threshold, block_on, num_perm, ngram):
+        keys = self.df if columns is None else self.df[list(columns)]
+        blocks = None
+        if block_on is not None:
+            blocks = self.df[[block_on] if isinstance(block_on, str) else list(block_on)]
+        return find_near_duplicates(keys, threshold, num_perm, ngram, blocks)
     
     def get_missing_value(self):
         """
@@ -84,7 +993,16 @@ class DataFrame:
         Series
             A Series with the count of missing values in each column.
         """
-        return self.df.isnull().sum()
+        if self.streaming:
+            missing = None
+            for batch in self.iter_batches():
+                counts = batch.isnull().sum()
+                missing = counts if missing is None else missing.add(counts, fill_value=0)
+            return pd.Series(dtype="int64") if missing is None else missing.astype("int64")
+        if self._running is not None:
+            return self._running.missing.reindex(self.df.columns, fill_value=0)
+
+        return self.get_profile()["missing"]
     
     def get_amount_missing_values(self):
         """
@@ -95,7 +1013,9 @@ class DataFrame:
         int
             The total count of missing values across all columns in the DataFrame.
         """
-        return self.df.isnull().sum().sum()
+        if self.streaming or self._running is not None:
+            return int(self.get_missing_value().sum())
+        return self.get_profile()["amount_missing"]
     
     def get_columns_missing_values(self):
         """
@@ -106,134 +1026,359 @@ class DataFrame:
         list
             A list of column names that contain missing values.
         """
-        return list(self.df.columns[self.df.isnull().any()])
+        if self.streaming or self._running is not None:
+            missing = self.get_missing_value()
+            return list(missing.index[missing > 0])
+        return self.get_profile()["columns_missing"]
     
-    def get_general_stats(self):
-        return self.df.describe(include='all')
+    def get_general_stats(self, approximate=False, k=KLL_K, precision=HLL_PRECISION, top_k=TOP_K):
+        """
+        Returns the general statistics of every column, as DataFrame.describe(include='all').
+
+        The exact statistics need every value in memory, with a sort per quantile and a
+        hash table per distinct count. The approximate statistics are read from the
+        sketches built by get_sketch in one pass, in constant memory per column: the
+        count, mean, std, min and max stay exact, the quantiles, distinct counts and
+        top values are approximate within the bounds documented in sketches.py.
+        A streamed DataFrame always gets the approximate statistics.
+
+        Parameters
+        ----------
+        approximate : bool, optional
+            If True, the statistics are approximated from sketches. The default is False.
+        k, precision, top_k
+            The sketch parameters, see get_sketch.
+
+        Returns
+        -------
+        pd.DataFrame
+            The statistics, one column per column of the DataFrame.
+        """
+        if approximate or self.streaming:
+            return self.get_sketch(k, precision, top_k).describe()
+        return self.get_profile()["stats"]
+
+    def get_sketch(self, k=KLL_K, precision=HLL_PRECISION, top_k=TOP_K):
+        """
+        Builds the sketches of every column in one pass over the data.
+
+        In streaming mode the batches are sketched as they are read. In memory, if an
+        executor is set, the rows are split among the workers, each part is sketched in
+        parallel and the sketches are merged.
+
+        Parameters
+        ----------
+        k : int, optional
+            The KLL parameter of the quantile sketches; the rank error is about
+            1.65% at k=200 and shrinks in proportion to 1/k. The default is KLL_K.
+        precision : int, optional
+            The HyperLogLog precision of the distinct counts; the relative error is
+            1.04 / sqrt(2**precision). The default is HLL_PRECISION.
+        top_k : int, optional
+            The number of top values tracked per column. The default is TOP_K.
+
+        Returns
+        -------
+        sketches.FrameSketch
+            The sketches, which can be merged with the sketches of other data.
+        """
+        if self.executor is not None and not self.streaming and len(self.df) > 1:
+            workers = self.n_workers or os.cpu_count() or 1
+            bounds = np.linspace(0, len(self.df), min(workers, len(self.df)) + 1).astype(np.int64)
+            parts = [self.df.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+            with EXECUTORS[self.executor](max_workers=self.n_workers) as pool:
+                sketches = list(pool.map(_sketch_batch, parts, *[[arg] * len(parts) for arg in (k, precision, top_k)]))
+            sketch = sketches[0]
+            for other in sketches[1:]:
+                sketch.merge(other)
+            return sketch
+
+        sketch = FrameSketch(k, precision, top_k)
+        for batch in self.iter_batches():
+            sketch.update(batch)
+        return sketch
     
     def get_info(self):
+        self._check_in_memory("get_info")
         return self.df.info()
     
     def get_data_report(self):
-        return self.get_info(), self.get_missing_value(), self.get_amount_missing_values(), self.get_duplicates(), self.get_amount_duplicates()
+        self._check_in_memory("get_data_report")
+        profile = self.get_profile()
+        return self.get_info(), profile["missing"], profile["amount_missing"], profile["duplicates"], profile["amount_duplicates"]
 
-    def get_correlation(self):
+    def get_correlation(self, method="pearson", filename="correlation.csv", dtype=np.float64,
+                        top_k=None, threshold=None, block_size=CORRELATION_BLOCK_SIZE):
         """
-        Writes the correlation between columns in the DataFrame to a csv file.
+        Computes the correlation between the numerical columns of the DataFrame and writes
+        it to a csv file.
+
+        Text and date columns are left out. The matrix is computed in blocks of columns
+        (see correlation.correlate), on n_workers threads when an executor is set, and
+        missing values are excluded pair by pair as in pandas. With thousands of columns
+        the full matrix is large, so top_k or threshold return only the strongest pairs,
+        without ever holding the matrix in memory.
 
-        The correlation between columns in the DataFrame is computed using the corr() method.
-        The result is then written to a csv file named "correlation.csv".
+        Parameters
+        ----------
+        method : str, optional
+            'pearson' or 'spearman' (the Pearson correlation of the ranks). The default
+            is 'pearson'.
+        filename : str, optional
+            The csv file the result is written to, None to only return it. The default
+            is "correlation.csv".
+        dtype : numpy dtype, optional
+            np.float32 halves the memory and time of the computation, for correlations
+            accurate to about 1e-6. The default is np.float64.
+        top_k : int, optional
+            If given, only the top_k pairs of columns with the largest absolute
+            correlation are returned. The default is None.
+        threshold : float, optional
+            If given, only the pairs of columns with an absolute correlation of at least
+            threshold are returned. The default is None.
+        block_size : int, optional
+            The number of columns per block. The default is CORRELATION_BLOCK_SIZE.
 
         Returns
         -------
-        None
+        pd.DataFrame
+            The correlation matrix or, with top_k or threshold, the pairs of columns
+            ('column_a', 'column_b', 'correlation'), strongest first.
         """
-        
-        return self.df.corr().to_csv("correlation.csv")
+        self._check_in_memory("get_correlation")
+        numeric = self.df.select_dtypes(include=["number", "bool"])
+        n_workers = (self.n_workers or os.cpu_count() or 1) if self.executor is not None else None
+        correlation = correlate(numeric, method, dtype, block_size, n_workers, top_k, threshold)
+        if filename is not None:
+            correlation.to_csv(filename, index=top_k is None and threshold is None)
+        return correlation
     
     def get_features_datatypes(self):
+        self._check_in_memory("get_features_datatypes")
         return self.df.dtypes
     
-    def is_datetime(self, column):
+    def is_datetime(self, column, sample_size=SAMPLE_SIZE):
         """
-        Checks if the first element in a column is a date or datetime format.
+        Checks if a column consistently holds dates or datetimes of a single format.
 
         Parameters
         ----------
         column : str
             The name of the column to be checked.
+        sample_size : int, optional
+            The maximum number of values looked at. The default is SAMPLE_SIZE.
 
         Returns
         -------
         bool
-            True if the first element is a date or datetime format, False otherwise.
+            True if the sampled values are all dates or datetimes, False otherwise.
         """
-        try:
-            parse(self.df[column][0])
-            return True
-        except ValueError:
-            return False
+        self._check_in_memory("is_datetime")
+        if not is_text(self.df[column]):
+            return pd.api.types.is_datetime64_any_dtype(self.df[column])
+        return infer_column_type(self.df[column], sample_size)["kind"] == "datetime"
     
-    def remove_formatting(self):
+    def remove_formatting(self, formats=None, sample_size=SAMPLE_SIZE):
         """
         Removes formatting from the DataFrame.
 
-        For each column in the DataFrame, the method checks the type of the column. If the column is of type 'object', the method applies the following formatting rules:
+        The type of each text column is inferred from a sample of its values (see
+        typeInference.infer_column_type) and the whole column is then converted with a
+        vectorized parser:
 
-        - If the column is a datetime, it is converted to a datetime64[ns] type.
-        - If the column contains numerical values separated by commas, the commas are removed and the column is converted to a float type.
+        - If the column holds datetimes of a consistent format, it is parsed with that format.
+        - If the column holds numbers, optionally with a currency symbol and thousands
+          separators, the separators are removed and the column is converted to a float type.
+        - If the column holds a boolean pattern (true/false, yes/no, ...), it is converted to bool.
         - For all other columns, the column is converted to lower case and all spaces are removed.
 
+        A column whose values do not all follow the inferred type is handled as a general
+        string column. The applied formats are kept in self.column_formats, so they can be
+        saved with save_column_formats and reused on later files with the same schema.
+
         Parameters
         ----------
+        formats : dict or str, optional
+            Formats to reuse instead of inferring them, as a dictionary of column name to
+            type specification or the path of a file written by save_column_formats.
+            Columns without a format are inferred. The default is None.
+        sample_size : int, optional
+            The maximum number of values sampled per column. The default is SAMPLE_SIZE.
+
+        Returns
+        -------
         None
+        """
+        self._check_in_memory("remove_formatting")
+        if isinstance(formats, str):
+            with open(formats, "r") as f:
+                formats = json.load(f)
+
+        self._invalidate_profile()
+        columns = [col for col in self.df.columns if _is_label(self.df[col])]
+        results = self._map_columns(_remove_column_formatting, columns, formats or {}, sample_size)
+        for col, (series, spec) in zip(columns, results):
+            self.df[col] = series
+            self.column_formats[str(col)] = spec
+
+        if self.compact_dtypes:
+            self.compact()
+
+    def compact(self, category_threshold=0.5):
+        """
+        Stores every column in the smallest dtype that keeps all of its values.
+
+        - Integer columns are downcast to the smallest integer width.
+        - Float columns holding whole numbers become nullable integers, the others are
+          downcast to float32 when no value changes.
+        - Text columns with at most category_threshold * rows distinct values become
+          'category', the other string columns a pandas string dtype (Arrow backed if
+          pyarrow is installed).
+
+        Parameters
+        ----------
+        category_threshold : float, optional
+            The maximum ratio of distinct values to rows for a text column to become a
+            category. The default is 0.5.
+
+        Returns
+        -------
+        pd.DataFrame
+            The memory report, with the dtype and the bytes of each column before and after.
+        """
+        self._check_in_memory("compact")
+        self._invalidate_profile()
+        before = self.df.memory_usage(deep=True, index=False)
+        dtypes = self.df.dtypes
+        columns = list(self.df.columns)
+        for col, series in zip(columns, self._map_columns(_compact_column, columns, category_threshold)):
+            self.df[col] = series
+        after = self.df.memory_usage(deep=True, index=False)
+
+        self.compaction_report = pd.DataFrame({
+            "dtype_before": dtypes.astype(str),
+            "dtype_after": self.df.dtypes.astype(str),
+            "bytes_before": before,
+            "bytes_after": after,
+        })
+        return self.compaction_report
+
+    def save_column_formats(self, filename="columnFormats.json"):
+        """
+        Saves the column formats detected by remove_formatting to a JSON file.
+
+        Parameters
+        ----------
+        filename : str, optional
+            The path of the file. The default is "columnFormats.json".
 
         Returns
         -------
         None
         """
-        for col in self.df.columns:
-            if self.df[col].dtype == 'object':
-                #Date and Time
-                if self.is_datetime(col):
-                    self.df[col] = self.df[col].astype('datetime64[ns]')
-                
-                #Money
-                elif not self.df[col].str.contains('[a-zA-Z]').any():
-                    self.df[col] = self.df[col].str.replace(',', '').astype(float)
+        with open(filename, "w") as f:
+            json.dump(self.column_formats, f, indent=4)
 
-                else:
-                    #General Strings
-                    self.df[col] = self.df[col].str.lower()
-                    self.df[col] = self.df[col].str.replace(" ", "")
+    def categorical_to_numeric(self, encodings=None, filename=None):
+        """
+        Converts categorical and boolean columns in the DataFrame to numeric values using encoding.
 
-            
-            
-    
-    def categorical_to_numeric(self):
-        """Converts categorical and boolean columns in the DataFrame to numeric values using encoding.
+        Text and category columns are label encoded: each value is replaced by its position
+        in the sorted array of the distinct values of the column. The codes are computed
+        with a single hash pass per column (pd.factorize), so only the distinct values are
+        sorted. Boolean columns are encoded as 0 and 1. Missing values get UNSEEN_CODE.
 
-        This function identifies columns with 'object' or 'bool' data types and applies:
-        - Label Encoding for categorical columns, replacing categories with integer labels.
-        - One-Hot Encoding for boolean columns, converting them into binary integer arrays.
-        
-        The mappings of original values to numeric representations are stored in a dictionary
-        and saved as a JSON file named 'categoricalFeaturesConversion.json'.
+        The categories of each column are kept in self.encodings. Passing them back, or the
+        file written by save_encodings, encodes new batches with the same codes without
+        refitting; values that were not seen when fitting get UNSEEN_CODE.
+
+        Parameters
+        ----------
+        encodings : dict or str, optional
+            The categories to reuse, as a dictionary of column name to array or the path
+            of a file written by save_encodings. Columns without categories are fitted.
+            The default is None.
+        filename : str, optional
+            If given, the categories are saved to this file with save_encodings.
+            The default is None.
 
         Returns
         -------
         dict
-            A dictionary containing the mappings of original categorical and boolean values
-            to their respective encoded numeric values for each column."""
+            A dictionary with the array of categories of each encoded column; the code of
+            a value is its position in the array.
+        """
+        self._check_in_memory("categorical_to_numeric")
+        if isinstance(encodings, str):
+            encodings = self.load_encodings(encodings)
 
+        self._invalidate_profile()
+        columns = [col for col in self.df.columns if _is_label(self.df[col]) or self.df[col].dtype == 'bool']
+        for col, (series, categories) in zip(columns, self._map_columns(_encode_column, columns, encodings or {})):
+            self.df[col] = series
+            self.encodings[col] = categories
 
-        categorical_dict = {}
-        for col in self.df.columns:
-            labelencoder = LabelEncoder()
-            onehotencoder = OneHotEncoder()
-            if self.df[col].dtype == 'object':
-                #storing the mapping
-                unique_values = self.df[col].unique()
-                encoded_values = labelencoder.fit_transform(unique_values)
-                integer_values = [int(label) for label in encoded_values]
-                categorical_dict[col] = dict(zip(unique_values, integer_values))
-
-                #transform categorical features into integers using label encoding
-                self.df[col] = labelencoder.fit_transform(self.df[col])
-
-            elif self.df[col].dtype == 'bool':
-                #storing the mapping
-                unique_values = self.df[col].unique()
-                encoded_values = onehotencoder.fit_transform(unique_values.reshape(-1, 1))
-                categorical_dict[col] = dict(zip(unique_values, encoded_values.astype(int)))
-
-                #transform categorical features into inetegers using label encoding
-                self.df[col] = onehotencoder.fit_transform(self.df[col])
-
-        with open("categoricalFeaturesConversion.json", "w") as f:
-            json.dump(categorical_dict, f, indent=4)
-
-        return categorical_dict
+        if filename is not None:
+            self.save_encodings(filename)
+
+        return self.encodings
+
+    def save_encodings(self, filename="categoricalFeatures.npz"):
+        """
+        Saves the categories found by categorical_to_numeric to a compressed numpy file.
+
+        Object arrays would need pickle, so categories of mixed types are saved as text
+        along with the type of each value, and load_encodings gives back the same values.
+
+        Parameters
+        ----------
+        filename : str, optional
+            The path of the file. The default is "categoricalFeatures.npz".
+
+        Raises
+        ------
+        ValueError
+            If a category is not a string, a number or a boolean.
+
+        Returns
+        -------
+        None
+        """
+        columns = list(self.encodings)
+        arrays = {}
+        for i, col in enumerate(columns):
+            categories = np.asarray(self.encodings[col])
+            if categories.dtype == object:
+                types = np.array([_category_type(value) for value in categories], dtype=str)
+                if (types != "str").any():
+                    arrays[f"types_{i}"] = types
+                categories = categories.astype(str)
+            arrays[f"categories_{i}"] = categories
+        np.savez_compressed(filename, columns=np.array([str(col) for col in columns]), **arrays)
+
+    def load_encodings(self, filename="categoricalFeatures.npz"):
+        """
+        Loads categories saved with save_encodings.
+
+        Parameters
+        ----------
+        filename : str, optional
+            The path of the file. The default is "categoricalFeatures.npz".
+
+        Returns
+        -------
+        dict
+            A dictionary with the array of categories of each column.
+        """
+        encodings = {}
+        with np.load(filename) as data:
+            for i, col in enumerate(data["columns"]):
+                categories = data[f"categories_{i}"]
+                if f"types_{i}" in data:
+                    categories = np.array([CATEGORY_TYPES[kind](text) for text, kind in zip(categories, data[f"types_{i}"])],
+                                          dtype=object)
+                encodings[col] = categories
+        return encodings
     
     def fill_column_missing_values(self, column, method="mean"):
         """
@@ -250,26 +1395,180 @@ class DataFrame:
             'fill' - fills with the string "NA".
             'zero' - fills with 0.
 
+        In streaming mode the fill value is computed in one pass over the batches and the
+        fill itself is applied to every batch as it is read.
+
         Returns
         -------
         None
         """
+        self.fill_missing_values({column: method})
+
+    def fill_missing_values(self, methods):
+        """
+        Fills missing values in several columns at once.
+
+        The fill values of all the columns are computed first and applied together, so in
+        streaming mode a single pass over the batches computes every mean and median and
+        a single batch transform applies every fill. In memory the columns are filled in
+        parallel if an executor is set.
+
+        Parameters
+        ----------
+        methods : dict
+            The method of each column, see fill_column_missing_values. Text columns and
+            unknown methods are left unchanged.
+
+        Returns
+        -------
+        None
+        """
+        if self.streaming:
+            values = self._streaming_fill_values(methods)
+            #as in memory, a 'fill' turns the column to object, also in the batches with
+            #nothing to fill
+            casts = {col: object for col, method in methods.items() if col in values and method == "fill"}
+            if values:
+                self._batch_transforms.append(lambda batch: batch.astype(casts).fillna(values))
+            return
+
+        self._invalidate_profile()
+        columns = list(methods)
+        for column, series in zip(columns, self._map_columns(_fill_column, columns, methods)):
+            if series is not None:
+                self.df[column] = series
+
+    def _streaming_fill_values(self, methods):
+        totals = {}
+        counts = {}
+        values = {}
+        labels = None
+        for batch in self.iter_batches():
+            if labels is None:
+                #every batch has the dtypes of the whole data, see iter_batches
+                labels = {col for col in methods if _is_label(batch[col])}
+                columns = [col for col, method in methods.items()
+                           if method in ("mean", "median") and col not in labels]
+                if not columns:
+                    break
+            for col in columns:
+                if methods[col] == "mean":
+                    totals[col] = totals.get(col, 0) + batch[col].sum()
+                    counts[col] = counts.get(col, 0) + batch[col].count()
+                else:
+                    #the median needs every value, but only of its own column
+                    values.setdefault(col, []).append(batch[col].dropna())
+
+        fills = {}
+        for col, method in methods.items():
+            if labels is None or col in labels:
+                continue
+            if method == "mean" and counts.get(col):
+                fills[col] = totals[col] / counts[col]
+            elif method == "median" and col in values:
+                fills[col] = pd.concat(values[col]).median()
+            elif method == "fill":
+                fills[col] = "NA"
+            elif method == "zero":
+                fills[col] = 0
+        return fills
+
+    def remove_duplicates(self, subset=None, n_partitions=DEDUP_PARTITIONS, tmpdir=None):
+        """
+        Removes duplicate rows, keeping the first occurrence.
+
+        In streaming mode the data does not need to fit in memory: the rows are hashed and
+        spilled into n_partitions files on disk, each partition is deduplicated on its own
+        and the duplicate rows are then dropped from every batch as it is read.
+
+        Parameters
+        ----------
+        subset : list, optional
+            The columns that identify a duplicate. The default is None (all columns).
+        n_partitions : int, optional
+            The number of on-disk partitions in streaming mode; each one should fit in
+            memory. The default is DEDUP_PARTITIONS.
+        tmpdir : str, optional
+            The directory of the partition files. The default is None (system temp directory).
+
+        Returns
+        -------
+        None
+        """
+        if self.streaming:
+            duplicates = self._streaming_duplicates(subset, n_partitions, tmpdir)
+            self._batch_transforms.append(lambda batch: batch[~_isin_sorted(batch.index, duplicates)])
+            return
+
+        self._invalidate_profile()
+        self.df.drop_duplicates(subset=subset, inplace=True)
+
+    def remove_near_duplicates(self, columns=None, threshold=THRESHOLD, strategy="first", block_on=None,
+                               num_perm=NUM_PERM, ngram=NGRAM):
+        """
+        Removes near-duplicate rows, keeping one row per cluster found by get_near_duplicates.
+
+        Parameters
+        ----------
+        columns : list, optional
+            The key columns to be compared. The default is None (all columns).
+        threshold : float, optional
+            The minimum estimated similarity between two linked rows. The default is THRESHOLD.
+        strategy : str, optional
+            The row kept for each cluster:
+            'first' - the first row of the cluster (default).
+            'most_complete' - the row with the fewest missing values, the first one on ties.
+            'merge' - the first row, with its missing values filled from the other rows of
+            the cluster in order.
+        block_on : str or list, optional
+            Blocking column(s); only rows with equal values in them are compared.
+            The default is None.
+        num_perm : int, optional
+            The MinHash signature length. The default is NUM_PERM.
+        ngram : int, optional
+            The length of the character n-grams. The default is NGRAM.
+
+        Raises
+        ------
+        ValueError
+            If the strategy is not supported.
+
+        Returns
+        -------
+        None
+        """
+        if strategy not in ("first", "most_complete", "merge"):
+            raise ValueError("Invalid near-duplicate strategy")
+        self._check_in_memory("remove_near_duplicates")
+
+        clusters = self._near_duplicate_positions(columns, threshold, block_on, num_perm, ngram)
+        positions = clusters["position"].to_numpy()
+        cluster = clusters["cluster"].to_numpy()
+        self._invalidate_profile()
+
+        if strategy == "most_complete":
+            missing = self.df.isnull().sum(axis=1).to_numpy()[positions]
+            order = np.lexsort((positions, missing, cluster))
+            is_first = np.r_[True, cluster[order][1:] != cluster[order][:-1]]
+            keepers = positions[order][is_first]
+        else:
+            keepers = np.unique(cluster)
 
-        if self.df[column].dtype == 'object':
-            pass
-        if method == "mean" and self.df[column].dtype != 'object':
-            self.df[column] = self.df[column].fillna(self.df[column].mean())
-        elif method == "median" and self.df[column].dtype != 'object':
-            self.df[column] = self.df[column].fillna(self.df[column].median())
-        elif method == "fill" and self.df[column].dtype != 'object':
-            self.df[column] = self.df[column].fillna("NA")
-        elif method == "zero" and self.df[column].dtype != 'object':
-            self.df[column] = self.df[column].fillna(0)
+        if strategy == "merge" and len(positions):
+            merged = self.df.iloc[positions].groupby(cluster, sort=True).first()
+            for j in range(self.df.shape[1]):
+                self.df.iloc[merged.index, j] = merged.iloc[:, j].to_numpy()
 
-    def remove_duplicates(self):
-        self.df.drop_duplicates(inplace=True)
+        keep = np.ones(len(self.df), dtype=bool)
+        keep[positions] = False
+        keep[keepers] = True
+        self.df = self.df[keep]
 
     def remove_NaN(self):
+        if self.streaming:
+            self._batch_transforms.append(lambda batch: batch.dropna())
+            return
+        self._invalidate_profile()
         self.df.dropna(inplace=True)
 
     
@@ -280,12 +1579,15 @@ class DataFrame:
         Parameters
         ----------
         population : float, optional
-            proportion of the population with the characteristic of interest. The default is 100.
+            The size of the population. The default is 100.
         confidence_level : float, optional
-            The desired confidence level. The default is 0.95.
+            The desired confidence level, any value between 0 and 1. The default is 0.95.
         margin_of_error : float, optional
             The desired margin of error. The default is 0.05.
         
+        The z-value of the confidence level is computed from the normal distribution and
+        cached, so repeated calls do no I/O.
+
         Returns
         -------
         int
@@ -294,13 +1596,8 @@ class DataFrame:
         if population <= 0 or (confidence_level <= 0 or confidence_level >= 1) or (margin_of_error <= 0 or margin_of_error >= 1):
             raise ValueError("All inputs must be greater than 0")
         
-
-        confidence_level =  1-(1-confidence_level)/2
-        with open("randomSample.json", "r") as f:
-            data = json.load(f)
-        
-        temp_confidence_level = data["values"][str(confidence_level)]
-        equation = (((temp_confidence_level**2) * 0.5 * (1-0.5))/(margin_of_error**2))/(1+((temp_confidence_level**2 * 0.5 *(1-0.5)))/(margin_of_error**2*population))
+        z = _z_value(confidence_level)
+        equation = (((z**2) * 0.5 * (1-0.5))/(margin_of_error**2))/(1+((z**2 * 0.5 *(1-0.5)))/(margin_of_error**2*population))
         
         return math.ceil(equation)
         
@@ -311,7 +1608,7 @@ class DataFrame:
         Parameters
         ----------
         population : float, optional
-            proportion of the population with the characteristic of interest. The default is 100.
+            The size of the population. The default is 100.
         confidence_level : float, optional
             The desired confidence level. The default is 0.95.
         margin_of_error : float, optional
@@ -322,94 +1619,363 @@ class DataFrame:
         bool
             True if the DataFrame size is sufficient, False otherwise.
         """
+        self._check_in_memory("check_df_size")
         return self.generate_sample_size(population, confidence_level, margin_of_error) < self.df.shape[0]
-    
-    def detect_outliers(self):
+
+    def fast_analysis(self, confidence_level=0.95, margin_of_error=0.05, full=False, outlier_method="zscore", seed=0):
         """
-        Detects outliers in numerical columns of the DataFrame using the Z-score method.
+        Profiles the data, detects outliers and infers the column types on a random sample.
 
-        Outliers are identified as values with a Z-score greater than 3.
-        The function computes the mean and standard deviation for each numeric column,
-        calculates the Z-score for each value, and flags outliers based on the threshold.
-        Detected outliers are stored in a dictionary with row indices as keys and a list
-        of tuples indicating the column name and outlier value.
+        The sample has the size given by generate_sample_size for the number of rows, so
+        the reported rates are within margin_of_error of the rates of the whole data at
+        the confidence level. Each rate comes with its Wilson score interval, which does
+        not apply the finite population correction and so is slightly conservative.
+        In streaming mode the sample is drawn in one pass over the batches (each row
+        gets a random key and the rows with the smallest keys are kept), without loading
+        the data.
 
-        The outliers' information is saved to a JSON file named "outliersDetection.json".
+        Parameters
+        ----------
+        confidence_level : float, optional
+            The confidence level of the sample size and the intervals. The default is 0.95.
+        margin_of_error : float, optional
+            The margin of error of the sample size. The default is 0.05.
+        full : bool, optional
+            If True, the analysis runs on every row instead and the rates are exact.
+            The default is False.
+        outlier_method : str, optional
+            The outlier detection method, see detect_outliers. The default is 'zscore'.
+        seed : int, optional
+            The seed of the sample. The default is 0.
+
+        Raises
+        ------
+        ValueError
+            If the outlier method is not supported.
 
         Returns
         -------
         dict
-            A dictionary containing indices as keys and lists of tuples with column names
-            and outlier values as values.
+            A dictionary with the keys:
+            'rows' - the number of rows of the data.
+            'sample_size' - the number of rows analysed.
+            'missing' - the rate of missing values of each column, with its 'lower' and
+            'upper' bounds.
+            'outliers' - the rate of outliers of each numerical column, with its bounds.
+            'types' - the inferred type specification of each text column.
+            'stats' - the general statistics of the analysed rows.
         """
+        if outlier_method not in OUTLIER_THRESHOLDS:
+            raise ValueError("Invalid outlier detection method")
+
+        sample, rows = self._analysis_sample(confidence_level, margin_of_error, full, seed)
+        n = len(sample)
+        z = _z_value(confidence_level)
+
+        def rates(counts):
+            table = pd.DataFrame({"rate": counts / n if n else np.nan}, index=counts.index)
+            if full or not n:
+                table["lower"] = table["upper"] = table["rate"]
+            else:
+                table["lower"], table["upper"] = _wilson_interval(counts.astype(float), n, z)
+            return table
 
+        numeric = sample.select_dtypes(include="number")
+        threshold = OUTLIER_THRESHOLDS[outlier_method]
         outliers = {}
-        for col in self.df.columns:
-            if self.df[col].dtype in ['int64', 'int32', 'float64', 'float32']:
-                mean = np.mean(self.df[col])
-                std = np.std(self.df[col])
-                z_scores = np.abs((self.df[col] - mean) / std)
-                outlier_rows = self.df[(z_scores > 3)].index
-                for row in outlier_rows:
-                    outliers[str(row)] = [(col, int(self.df.loc[row, col]))]
+        for col in numeric.columns:
+            lower, upper = _outlier_bounds(numeric[col], outlier_method, threshold)
+            outliers[col] = int(((numeric[col] < lower) | (numeric[col] > upper)).sum())
+
+        return {
+            "rows": rows,
+            "sample_size": n,
+            "missing": rates(sample.isnull().sum()),
+            "outliers": rates(pd.Series(outliers, index=numeric.columns, dtype="int64")),
+            "types": {str(col): infer_column_type(sample[col], max(n, 1)) for col in sample.columns if is_text(sample[col])},
+            "stats": sample.describe(include="all") if len(sample.columns) else pd.DataFrame(),
+        }
 
+    def _analysis_sample(self, confidence_level, margin_of_error, full, seed):
+        """
+        Returns the rows to analyse and the number of rows of the data, see fast_analysis.
+        """
+        if not self.streaming:
+            rows = len(self.df)
+            if full or rows == 0:
+                return self.df, rows
+            size = min(self.generate_sample_size(rows, confidence_level, margin_of_error), rows)
+            return self.df.sample(size, random_state=seed), rows
 
-        with open("outliersDetection.json", "w") as f:
-            json.dump(outliers, f, indent=4)
+        if full:
+            batches = list(self.iter_batches())
+            frame = pd.concat(batches) if batches else pd.DataFrame()
+            return frame, len(frame)
 
-        return outliers
+        #the sample size only shrinks with the number of rows, so the rows with the
+        #smallest keys are kept up to the size for an infinite population
+        capacity = math.ceil(_z_value(confidence_level)**2 * 0.25 / margin_of_error**2)
+        rng = np.random.default_rng(seed)
+        kept = None
+        keys = np.empty(0)
+        rows = 0
+        for batch in self.iter_batches():
+            rows += len(batch)
+            kept = batch if kept is None else pd.concat([kept, batch])
+            keys = np.concatenate((keys, rng.random(len(batch))))
+            if len(kept) > capacity:
+                smallest = np.argpartition(keys, capacity)[:capacity]
+                kept, keys = kept.iloc[smallest], keys[smallest]
+        if kept is None:
+            return pd.DataFrame(), 0
+        size = min(self.generate_sample_size(rows, confidence_level, margin_of_error), rows)
+        return kept.iloc[np.argsort(keys, kind="stable")[:size]].sort_index(), rows
     
-    def handle_outliers(self, json_file="outliersDetection.json", method="median"):
+    def detect_outliers(self, method="zscore", threshold=None, filename=None):
+        """
+        Detects outliers in numerical columns of the DataFrame.
+
+        Two methods are available:
+        - 'zscore' flags values whose Z-score is greater than threshold (default 3).
+        - 'iqr' flags values below Q1 - threshold * IQR or above Q3 + threshold * IQR
+          (default 1.5).
+
+        The statistics of each column are computed once and the values are compared
+        against the resulting bounds in a single vectorized step. The outliers are kept
+        on the object as a boolean mask (self.outliers) together with the bounds of each
+        column (self.outlier_bounds), ready for handle_outliers.
+
+        Parameters
+        ----------
+        method : str, optional
+            The detection method, 'zscore' or 'iqr'. The default is 'zscore'.
+        threshold : float, optional
+            The detection threshold. The default depends on the method.
+        filename : str, optional
+            If given, the outliers are also saved to this file with save_outliers.
+            The default is None.
+
+        Raises
+        ------
+        ValueError
+            If the method is not supported.
+
+        Returns
+        -------
+        pd.DataFrame
+            A boolean DataFrame with the numerical columns, True where the value is an outlier.
+        """
+        self._check_in_memory("detect_outliers")
+        if method not in OUTLIER_THRESHOLDS:
+            raise ValueError("Invalid outlier detection method")
+        if threshold is None:
+            threshold = OUTLIER_THRESHOLDS[method]
+
+        numeric = self.df.select_dtypes(include="number")
+        if method == "zscore" and self._running is not None:
+            #the running mean and variance kept by append
+            lower, upper = self._running.zscore_bounds(numeric.columns, threshold)
+        else:
+            bounds = self._map_columns(_outlier_bounds, numeric.columns, method, threshold)
+            lower = pd.Series([bound[0] for bound in bounds], index=numeric.columns, dtype=float)
+            upper = pd.Series([bound[1] for bound in bounds], index=numeric.columns, dtype=float)
+
+        self.outliers = (numeric.lt(lower, axis=1) | numeric.gt(upper, axis=1)).fillna(False).astype(bool)
+        self.outlier_bounds = pd.DataFrame({"lower": lower, "upper": upper})
+        self.outlier_method = (method, threshold)
+
+        if filename is not None:
+            self.save_outliers(filename)
+
+        return self.outliers
+
+    def save_outliers(self, filename="outliersDetection.npz"):
+        """
+        Saves the detected outliers to a compressed numpy file.
+
+        Only the flagged cells are stored, as row positions and column codes, along
+        with the bounds of every column.
+
+        Parameters
+        ----------
+        filename : str, optional
+            The path of the file. The default is "outliersDetection.npz".
+
+        Raises
+        ------
+        ValueError
+            If detect_outliers has not been run.
+
+        Returns
+        -------
+        None
+        """
+        if self.outliers is None:
+            raise ValueError("No outliers detected, run detect_outliers first")
+
+        rows, cols = np.nonzero(self.outliers.to_numpy())
+        np.savez_compressed(
+            filename,
+            rows=rows.astype(np.int64),
+            cols=cols.astype(np.int32),
+            columns=np.array([str(col) for col in self.outliers.columns]),
+            lower=self.outlier_bounds["lower"].to_numpy(),
+            upper=self.outlier_bounds["upper"].to_numpy(),
+            n_rows=len(self.outliers),
+        )
+
+    def load_outliers(self, filename="outliersDetection.npz"):
+        """
+        Loads outliers saved with save_outliers as the current outliers.
+
+        Parameters
+        ----------
+        filename : str, optional
+            The path of the file. The default is "outliersDetection.npz".
+
+        Raises
+        ------
+        ValueError
+            If the file does not match the shape of the DataFrame.
+
+        Returns
+        -------
+        pd.DataFrame
+            The boolean outlier mask.
+        """
+        self._check_in_memory("load_outliers")
+        with np.load(filename) as data:
+            if int(data["n_rows"]) != len(self.df):
+                raise ValueError("The outliers file does not match the DataFrame")
+            columns = [self._column_by_name(col) for col in data["columns"]]
+            values = np.zeros((len(self.df), len(columns)), dtype=bool)
+            values[data["rows"], data["cols"]] = True
+            self.outliers = pd.DataFrame(values, index=self.df.index, columns=columns)
+            self.outlier_method = None
+            self.outlier_bounds = pd.DataFrame({"lower": data["lower"], "upper": data["upper"]}, index=columns)
+
+        return self.outliers
+
+    def _column_by_name(self, name):
+        for col in self.df.columns:
+            if str(col) == name:
+                return col
+        raise ValueError(f"Column {name} not found")
+
+    def handle_outliers(self, filename=None, method="median"):
         """
         Handles outliers in the DataFrame based on the specified method.
 
+        The replacement statistic of each column is computed once and all the outliers
+        are replaced in one vectorized step.
+
         Parameters
         ----------
-        json_file : str, optional
-            The path to the JSON file containing the outliers information.
-            The default is "outliersDetection.json".
+        filename : str, optional
+            A file written by save_outliers to load the outliers from. If None, the
+            outliers of the last detect_outliers call are used, and detect_outliers is
+            run with its defaults if there are none. The default is None.
         method : str, optional
-            The method to use for handling outliers ('median', 'mean', 'mode', 'remove').
+            The method to use for handling outliers:
+            'median', 'mean', 'mode' - replaces outliers with that statistic of the column.
+            'clip' - caps outliers to the detection bounds of the column.
+            'remove' - removes the rows containing an outlier.
             The default is 'median'.
 
+        Raises
+        ------
+        ValueError
+            If the method is not supported.
+
         Returns
         ------- 
-        None
+        pd.DataFrame
+            The DataFrame with the outliers handled.
         """
-        with open(json_file, "r") as f:
-            outliers = json.load(f)
-
-        for row in outliers:
-            for col, value in outliers[row]:
-                if method == "median":
-                    self.df.at[int(row), col] = np.median(self.df[col])
-                    print(f"Replaced {value} with {np.median(self.df[col])}")
-                elif method == "mean":
-                    self.df.at[int(row), col] = np.mean(self.df[col])
-                    print(f"Replaced {value} with {np.mean(self.df[col])}")
-                elif method == "mode":
-                    self.df.at[int(row), col] = np.mode(self.df[col])
-                    print(f"Replaced {value} with {np.mode(self.df[col])}")
-                elif method == "remove":
-                    self.df = self.df[self.df[col] != value]    
-                    print(f"Removed {value}")
+        self._check_in_memory("handle_outliers")
+        if method not in ("median", "mean", "mode", "clip", "remove"):
+            raise ValueError("Invalid outlier handling method")
+
+        if filename is not None:
+            self.load_outliers(filename)
+        elif self.outliers is None:
+            self.detect_outliers()
+
+        self._invalidate_profile()
+        mask = self.outliers.reindex(index=self.df.index, fill_value=False)
+        cols = list(mask.columns[mask.any()])
+        if not cols:
+            return self.df
+
+        if method == "remove":
+            self.df = self.df[~mask[cols].any(axis=1)]
+            print(f"Removed {len(mask) - len(self.df)} rows with outliers")
+            return self.df
+
+        #nullable integer columns cannot hold the fractional statistics and bounds
+        values = self.df[cols].astype({col: float for col in cols
+                                       if isinstance(self.df[col].dtype, pd.api.extensions.ExtensionDtype)})
+        if method == "median":
+            replacement = values.median()
+        elif method == "mean":
+            replacement = values.mean()
+        elif method == "mode":
+            replacement = values.mode().iloc[0]
+        if method == "clip":
+            bounds = self.outlier_bounds.loc[cols]
+            self.df[cols] = values.clip(bounds["lower"], bounds["upper"], axis=1)
+        else:
+            self.df[cols] = values.mask(mask[cols], replacement, axis=1)
+
+        for col in cols:
+            replaced_with = "the bounds" if method == "clip" else replacement[col]
+            print(f"Replaced {int(mask[col].sum())} outliers in {col} with {replaced_with}")
 
         return self.df
-                
 
     def get_sample(self):
+        self._check_in_memory("get_sample")
         return self.df.sample()
 
     def get_head(self, n = 5):
+        self._check_in_memory("get_head")
         return self.df.head(n)
     
     def to_csv(self, filename):
+        """
+        Writes the DataFrame to a csv file.
+
+        In streaming mode the batches are written one after another, so the file is
+        produced without loading the data in memory.
+
+        Parameters
+        ----------
+        filename : str
+            The path of the csv file.
+
+        Returns
+        -------
+        None
+        """
+        if self.streaming:
+            with open(filename, "w", newline="") as f:
+                header = True
+                for batch in self.iter_batches():
+                    batch.to_csv(f, header=header)
+                    header = False
+            return None
+
         return self.df.to_csv(filename)
     
     def to_xlsx(self, filename):
+        self._check_in_memory("to_xlsx")
         return self.df.to_excel(filename)
     
     def head_image(self):
+        self._check_in_memory("head_image")
+        #matplotlib is only needed here, it is imported on first use to keep import cleanData fast
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots(figsize=(12, 4))
         ax.axis('tight')
         ax.axis('off')
@@ -0,0 +1,215 @@
+import hashlib
+import importlib.util
+import json
+import os
+import time
+
+CACHE_DIR = os.environ.get("DCA_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "DataCleaningAssistant"))
+MAX_BYTES = 4 * 1024**3
+CACHE_VERSION = 2
+
+def cache_enabled():
+    """
+    Checks if the load cache can be used: pyarrow is installed and DCA_CACHE is not "0".
+    """
+    return os.environ.get("DCA_CACHE", "1") != "0" and importlib.util.find_spec("pyarrow") is not None
+
+def _to_pandas(arrow_data):
+    df = arrow_data.to_pandas()
+    #Arrow gives None for the missing values of object columns, where the readers give NaN
+    for j, dtype in enumerate(df.dtypes):
+        if dtype == object:
+            column = df.iloc[:, j]
+            df.iloc[:, j] = column.where(column.notna(), float("nan"))
+    return df
+
+def file_digest(filepath, block_size=1024**2):
+    """
+    Returns the BLAKE2b digest of the content and the extension of a file; the same
+    bytes read as another format are another entry.
+    """
+    extension = os.path.splitext(filepath)[1].lower()
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"v{CACHE_VERSION}{extension}\0".encode())
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class LoadCache:
+    """
+    On-disk cache of parsed files, stored as Feather (Arrow IPC) files.
+
+    Entries are addressed by the digest of the file content and format (see file_digest),
+    and the index remembers the path, size and modification time each digest was last
+    seen with, so reopening an unchanged file costs a stat call and a memory-mapped read,
+    without hashing the file.
+    When the total size of the cache goes over max_bytes, the least recently used
+    entries are evicted.
+    """
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(directory, "index.json")
+        self._digests = {}  # the digests of the files hashed by this cache, by path, size and mtime
+
+    def load(self, filepath, reader):
+        """
+        Returns the parsed content of a file, from the cache if possible.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the file containing the data.
+        reader : callable
+            Called with filepath to parse the file on a cache miss.
+
+        Returns
+        -------
+        pd.DataFrame
+            The parsed data.
+        """
+        index, digest, path, stat = self._find(filepath)
+        if self._touch(index, digest, path, stat):
+            return self._read_entry(digest)
+
+        df = reader(filepath)
+        self._store(index, digest, df, path, stat)
+        return df
+
+    def read_batches(self, filepath, chunksize):
+        """
+        Returns the parsed content of a file in batches, read from the memory-mapped
+        cache entry, or None if the file is not cached.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the file containing the data.
+        chunksize : int
+            The number of rows per batch.
+
+        Returns
+        -------
+        iterator of pd.DataFrame or None
+            The batches of the data, None on a cache miss.
+        """
+        index, digest, path, stat = self._find(filepath)
+        if not self._touch(index, digest, path, stat):
+            return None
+        return self._iter_entry(digest, chunksize)
+
+    def store(self, filepath, df):
+        """
+        Caches the parsed content of a file read without the cache, e.g. in batches.
+        Nothing is done if the file is already cached.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the file containing the data.
+        df : pd.DataFrame
+            The parsed data, as read_file returns it.
+
+        Returns
+        -------
+        None
+        """
+        index, digest, path, stat = self._find(filepath)
+        if not self._touch(index, digest, path, stat):
+            self._store(index, digest, df, path, stat)
+
+    def clear(self):
+        """Removes every entry of the cache."""
+        for digest in self._read_index():
+            self._remove_entry(digest)
+        if os.path.exists(self.index_path):
+            os.remove(self.index_path)
+
+    def _find(self, filepath):
+        index = self._read_index()
+        stat = os.stat(filepath)
+        path = os.path.abspath(filepath)
+        state = (path, stat.st_size, stat.st_mtime_ns)
+        digest = next((key for key, entry in index.items()
+                       if entry["path"] == path and entry["size"] == stat.st_size
+                       and entry["mtime_ns"] == stat.st_mtime_ns and entry.get("version") == CACHE_VERSION), None)
+        if digest is None:
+            digest = self._digests.get(state) or file_digest(filepath)
+        self._digests[state] = digest
+        return index, digest, path, stat
+
+    def _touch(self, index, digest, path, stat):
+        #True on a cache hit, which is recorded as the last access of the entry
+        entry = index.get(digest)
+        if entry is None or not os.path.exists(self._entry_path(digest)):
+            return False
+        entry.update(path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns, last_access=time.time())
+        self._write_index(index)
+        return True
+
+    def _store(self, index, digest, df, path, stat):
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = self._entry_path(digest) + ".tmp"
+        try:
+            df.to_feather(temp_path)
+        except Exception:
+            #frames Arrow cannot store (mixed object columns, non-string column names, ...)
+            #are simply not cached
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        os.replace(temp_path, self._entry_path(digest))
+
+        index[digest] = {
+            "version": CACHE_VERSION,
+            "path": path,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "bytes": os.path.getsize(self._entry_path(digest)),
+            "last_access": time.time(),
+        }
+        self._evict(index)
+        self._write_index(index)
+
+    def _evict(self, index):
+        total = sum(entry["bytes"] for entry in index.values())
+        for digest in sorted(index, key=lambda key: index[key]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            total -= index[digest]["bytes"]
+            self._remove_entry(digest)
+            del index[digest]
+
+    def _read_entry(self, digest):
+        import pyarrow.feather as feather
+
+        return _to_pandas(feather.read_table(self._entry_path(digest), memory_map=True))
+
+    def _iter_entry(self, digest, chunksize):
+        import pyarrow.feather as feather
+
+        table = feather.read_table(self._entry_path(digest), memory_map=True)
+        for record_batch in table.to_batches(max_chunksize=chunksize):
+            yield _to_pandas(record_batch)
+
+    def _remove_entry(self, digest):
+        if os.path.exists(self._entry_path(digest)):
+            os.remove(self._entry_path(digest))
+
+    def _entry_path(self, digest):
+        return os.path.join(self.directory, f"{digest}.feather")
+
+    def _read_index(self):
+        try:
+            with open(self.index_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index):
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = self.index_path + f".{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(index, f, indent=4)
+        os.replace(temp_path, self.index_path)
@@ -1,8 +1,205 @@
 import tkinter as tk
 from tkinter import ttk, filedialog
-from PIL import Image, ImageTk
+import importlib
 import os
-import cleanData as cd
+import queue
+import threading
+
+# cleanData and pandas are imported where they are used, so the window is painted
+# before they load; DataCleaningAssistant preloads them in the background.
+
+LOAD_CHUNKSIZE = 100_000
+PRELOAD_DELAY = 100  # ms after start-up
+
+class JobCancelled(Exception):
+    pass
+
+class BackgroundJob:
+    """
+    Runs a task on a worker thread and hands its progress and result back to the Tk main loop.
+
+    The task is called with the job itself and reports its progress through report(),
+    which is also where a cancellation requested from the GUI takes effect. The main
+    loop polls the job every POLL_INTERVAL ms with root.after, so the callbacks always
+    run on the main thread and the window keeps repainting while the task runs.
+    """
+    POLL_INTERVAL = 16  # ms, about 60 fps
+
+    def __init__(self, root, task, on_progress, on_done, on_error, on_cancel, on_preview=None):
+        self.root = root
+        self.task = task
+        self.on_progress = on_progress
+        self.on_preview = on_preview
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        self._messages = queue.Queue()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        self.root.after(self.POLL_INTERVAL, self._poll)
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def report(self, phase, rows, preview=None):
+        """
+        Posts the progress of the task, and optionally rows to preview; called from the
+        worker thread.
+        """
+        if self._cancelled.is_set():
+            raise JobCancelled()
+        if preview is not None:
+            self._messages.put(("preview", preview))
+        self._messages.put(("progress", (phase, rows)))
+
+    def _run(self):
+        try:
+            self._messages.put(("done", self.task(self)))
+        except JobCancelled:
+            self._messages.put(("cancelled", None))
+        except Exception as error:
+            self._messages.put(("error", error))
+
+    def _poll(self):
+        progress = None
+        preview = None
+        result = None
+        while result is None:
+            try:
+                kind, payload = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                # only the latest progress is worth drawing
+                progress = payload
+            elif kind == "preview":
+                preview = payload
+            else:
+                result = (kind, payload)
+
+        if preview is not None and self.on_preview is not None:
+            self.on_preview(preview)
+        if progress is not None:
+            self.on_progress(*progress)
+        if result is None:
+            self.root.after(self.POLL_INTERVAL, self._poll)
+        elif result[0] == "done":
+            self.on_done(result[1])
+        elif result[0] == "error":
+            self.on_error(result[1])
+        else:
+            self.on_cancel()
+
+def load_file(filename, job, preview=False):
+    """
+    Loads and profiles a file in batches, reporting the rows read. If preview, the first
+    batch is also handed to the GUI to be previewed.
+    """
+    import cleanData as cd
+
+    #the file is cached once loaded, and read back from the cache when it is opened again
+    frame = cd.DataFrame(filename, chunksize=LOAD_CHUNKSIZE)
+    rows = 0
+
+    def loaded(batch):
+        nonlocal rows
+        job.report("Loading", rows + len(batch), batch if preview and rows == 0 else None)
+        rows += len(batch)
+
+    frame = cd.DataFrame(df=frame.load(loaded))
+    job.report("Profiling", rows)
+    #the counts shown by show_summary, computed here so the main thread only reads them
+    frame.get_amount_missing_values()
+    frame.get_amount_duplicates()
+    return frame
+
+def clean_frame(frame, job):
+    """Runs the cleaning steps on a copy of a loaded DataFrame, reporting each phase."""
+    import cleanData as cd
+
+    frame = cd.DataFrame(df=frame.df.copy())
+    rows = len(frame.df)
+    job.report("Removing formatting", rows)
+    frame.remove_formatting()
+    job.report("Removing duplicates", rows)
+    frame.remove_duplicates()
+    job.report("Profiling", len(frame.df))
+    frame.get_amount_missing_values()
+    frame.get_amount_duplicates()
+    return frame
+
+class PreviewTable(tk.Frame):
+    """
+    Table of the rows of a file, read straight from the source one page at a time.
+
+    Only the first page is read when a file is shown; the next pages are read from the
+    same open reader when the table is scrolled near its end, so showing a file costs
+    the same whatever its size.
+    """
+    PAGE_SIZE = 100
+    FETCH_AT = 0.9  # fraction of the table scrolled that triggers the next page
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.tree = ttk.Treeview(self, show="headings", height=10)
+        yscrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        xscrollbar = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
+        self.yscrollbar = yscrollbar
+        self.tree.configure(yscrollcommand=self.on_scroll, xscrollcommand=xscrollbar.set)
+        yscrollbar.pack(side="right", fill="y")
+        xscrollbar.pack(side="bottom", fill="x")
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.reader = None
+        self.pages = None
+
+    def show_file(self, filename):
+        import cleanData as cd
+
+        self.show_pages(cd.read_file(filename, chunksize=self.PAGE_SIZE))
+
+    def show_frame(self, df):
+        """Shows rows already in memory, e.g. the first batch of a background load."""
+        self.show_pages(df.iloc[start:start + self.PAGE_SIZE] for start in range(0, len(df), self.PAGE_SIZE))
+
+    def show_pages(self, reader):
+        self.close()
+        self.tree.delete(*self.tree.get_children())
+        self.tree["columns"] = ()
+        self.reader = reader
+        self.pages = iter(self.reader)
+        self.fetch_page()
+
+    def fetch_page(self):
+        import pandas as pd
+
+        batch = next(self.pages, None)
+        if batch is None:
+            self.close()
+            return
+
+        if not self.tree["columns"]:
+            columns = [str(i) for i in range(len(batch.columns))]
+            self.tree["columns"] = columns
+            for column, name in zip(columns, batch.columns):
+                self.tree.heading(column, text=str(name))
+                self.tree.column(column, width=120, stretch=False)
+
+        for row in batch.itertuples(index=False):
+            self.tree.insert("", "end", values=["" if pd.isna(value) else str(value) for value in row])
+
+    def on_scroll(self, first, last):
+        self.yscrollbar.set(first, last)
+        if self.pages is not None and float(last) >= self.FETCH_AT:
+            self.fetch_page()
+
+    def close(self):
+        if hasattr(self.reader, "close"):
+            self.reader.close()
+        self.reader = None
+        self.pages = None
 
 class DataCleaningAssistant:
     def __init__(self, root):
@@ -10,8 +207,16 @@ class DataCleaningAssistant:
         self.root.title("Data Cleaning Assistant")
         self.root.geometry("700x700")
         self.root.configure(bg="white")
+
+        self.frame = None
+        self.job = None
         
         self.setup_ui()
+        self.root.after(PRELOAD_DELAY, self.preload)
+
+    def preload(self):
+        """Imports the data modules on a worker thread once the window is up."""
+        threading.Thread(target=importlib.import_module, args=("cleanData",), daemon=True).start()
         
     def setup_ui(self):
         # Header section
@@ -33,6 +238,12 @@ class DataCleaningAssistant:
                                  width=20, height=2,
                                  command=self.upload_file)
         upload_button.pack(pady=10)
+
+        self.cancel_button = tk.Button(header_frame, text="Cancel",
+                                      font=("Arial", 10),
+                                      width=20, state="disabled",
+                                      command=self.cancel_job)
+        self.cancel_button.pack()
         
         # Settings section
         settings_frame = tk.Frame(self.root, bg="white", pady=20, padx=50)
@@ -88,15 +299,18 @@ class DataCleaningAssistant:
                                     fg="#AAAAAA", bg="#ECECEC",
                                     font=("Arial", 10))
         self.preview_label.pack(expand=True, fill="both", pady=115)
+
+        self.preview_table = PreviewTable(self.preview_frame, bg="#ECECEC")
         
         # Action button
         action_frame = tk.Frame(self.root, bg="white", pady=20)
         action_frame.pack(fill="x")
         
-        action_button = tk.Button(action_frame, text="Button", 
+        action_button = tk.Button(action_frame, text="Clean file", 
                                  bg="#2D2D2D", fg="white", 
                                  font=("Arial", 10),
-                                 width=30, height=3)
+                                 width=30, height=3,
+                                 command=self.clean_file)
         action_button.pack(pady=10)
         
     def create_switch(self, parent, variable):
@@ -142,10 +356,100 @@ class DataCleaningAssistant:
                       ("All files", "*.*"))
         )
         if filename:
-            df = cd.DataFrame(filename)
-            self.preview_label = ImageTk.PhotoImage(Image.open(df.head_image()))
             print(f"File selected: {filename}")
-            # Here you would add code to process the uploaded file
+            self.frame = None
+            shown = self.show_preview(filename)
+            self.start_job(lambda job: load_file(filename, job, preview=not shown))
+
+    def show_preview(self, filename):
+        """
+        Shows the first rows of a file. Returns False if the file has to be parsed
+        whole first: its rows are then previewed when the background load hands back its
+        first batch, so the file is parsed once and off the main thread.
+        """
+        import cleanData as cd
+
+        self.hide_table()
+        try:
+            if cd.file_format(filename) not in cd.INCREMENTAL_FORMATS:
+                return False
+            self.preview_table.show_file(filename)
+        except Exception as error:
+            self.preview_label.config(text=f"Error: {error}")
+            return True
+        self.show_table()
+        return True
+
+    def show_table(self):
+        self.preview_label.pack_configure(expand=False, pady=5)
+        self.preview_table.pack(expand=True, fill="both")
+
+    def hide_table(self):
+        self.preview_table.close()
+        self.preview_table.pack_forget()
+        self.preview_label.pack_configure(expand=True, pady=115)
+
+    def show_batch_preview(self, job, batch):
+        if job is self.job:
+            self.preview_table.show_frame(batch)
+            self.show_table()
+
+    def clean_file(self):
+        if self.frame is None:
+            return
+        frame = self.frame
+        self.start_job(lambda job: clean_frame(frame, job))
+
+    def start_job(self, task):
+        """Runs task in the background, replacing any running job."""
+        self.cancel_job()
+        job = BackgroundJob(self.root, task,
+                            lambda phase, rows: self.show_progress(job, phase, rows),
+                            lambda frame: self.job_done(job, frame),
+                            lambda error: self.job_failed(job, error),
+                            lambda: self.job_cancelled(job),
+                            lambda batch: self.show_batch_preview(job, batch))
+        self.job = job
+        self.cancel_button.config(state="normal")
+        self.show_progress(job, "Starting", 0)
+        job.start()
+
+    def cancel_job(self):
+        if self.job is not None:
+            self.job.cancel()
+
+    def finish_job(self, job):
+        """Returns True if job is the current job, which is then marked as finished."""
+        if job is not self.job:
+            # a replaced job, its results are stale
+            return False
+        self.job = None
+        self.cancel_button.config(state="disabled")
+        return True
+
+    def show_progress(self, job, phase, rows):
+        if job is self.job:
+            self.preview_label.config(text=f"{phase}... {rows:,} rows")
+
+    def job_done(self, job, frame):
+        if self.finish_job(job):
+            self.frame = frame
+            self.show_summary()
+
+    def job_failed(self, job, error):
+        if self.finish_job(job):
+            self.preview_label.config(text=f"Error: {error}")
+
+    def job_cancelled(self, job):
+        if self.finish_job(job):
+            self.preview_label.config(text="Cancelled")
+
+    def show_summary(self):
+        profile = self.frame.get_profile()
+        rows, columns = self.frame.df.shape
+        self.preview_label.config(text=f"{rows:,} rows x {columns} columns\n"
+                                       f"{profile['amount_missing']:,} missing values\n"
+                                       f"{profile['amount_duplicates']:,} duplicate rows")
             
 
 if __name__ == "__main__":
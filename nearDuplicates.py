@@ -0,0 +1,216 @@
+import numpy as np
+import pandas as pd
+
+NUM_PERM = 128
+NGRAM = 3
+THRESHOLD = 0.8
+MAX_BUCKET_PAIRS = 64  # rows of a larger bucket are only paired with their 64 neighbours
+
+def normalize_text(frame):
+    """
+    Builds the normalized text of each row from the given columns.
+
+    The values are joined with spaces, lower cased, and every run of characters that
+    are not letters or digits is replaced by a single space.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        The columns to be combined.
+
+    Returns
+    -------
+    pd.Series
+        The normalized text of each row.
+    """
+    columns = [frame[col].astype(str).where(frame[col].notna(), "") for col in frame.columns]
+    text = columns[0].str.cat(columns[1:], sep=" ") if len(columns) > 1 else columns[0]
+    return text.str.lower().str.replace(r"[\W_]+", " ", regex=True).str.strip()
+
+def minhash_signatures(texts, num_perm=NUM_PERM, ngram=NGRAM, seed=0):
+    """
+    Computes the MinHash signature of each text over its character n-grams.
+
+    The n-grams of all the texts are hashed at once with pandas' hash_array, then each
+    of the num_perm hash functions (multiply-shift hashing) is applied to the whole
+    array and reduced to a minimum per text in one vectorized pass.
+
+    Parameters
+    ----------
+    texts : pd.Series
+        The normalized texts.
+    num_perm : int, optional
+        The number of hash functions, i.e. the signature length. The default is NUM_PERM.
+    ngram : int, optional
+        The length of the character n-grams. The default is NGRAM.
+    seed : int, optional
+        The seed of the hash functions. The default is 0.
+
+    Returns
+    -------
+    np.ndarray
+        A uint32 array of shape (len(texts), num_perm). The fraction of equal positions in
+        two signatures estimates the Jaccard similarity of the two n-gram sets.
+    """
+    shingles = []
+    starts = np.empty(len(texts), dtype=np.int64)
+    for i, text in enumerate(texts):
+        starts[i] = len(shingles)
+        if len(text) <= ngram:
+            shingles.append(text)
+        else:
+            shingles.extend({text[j:j + ngram] for j in range(len(text) - ngram + 1)})
+
+    hashes = pd.util.hash_array(np.array(shingles, dtype=object))
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    offsets = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint32)
+    with np.errstate(over="ignore"):
+        for k in range(num_perm):
+            permuted = ((hashes * multipliers[k] + offsets[k]) >> np.uint64(32)).astype(np.uint32)
+            signatures[:, k] = np.minimum.reduceat(permuted, starts)
+    return signatures
+
+def lsh_bands(num_perm, threshold):
+    """
+    Chooses the number of LSH bands for a similarity threshold.
+
+    With b bands of r rows, two rows of Jaccard similarity s share at least one bucket
+    with probability 1 - (1 - s**r)**b, an S-curve whose midpoint is about (1/b)**(1/r).
+    The band count whose midpoint is closest to threshold is returned.
+
+    Parameters
+    ----------
+    num_perm : int
+        The signature length.
+    threshold : float
+        The similarity threshold.
+
+    Returns
+    -------
+    int
+        The number of bands, a divisor of num_perm.
+    """
+    divisors = [b for b in range(1, num_perm + 1) if num_perm % b == 0]
+    return min(divisors, key=lambda b: abs((1 / b) ** (b / num_perm) - threshold))
+
+def candidate_pairs(signatures, bands, blocks=None):
+    """
+    Returns the pairs of rows that share an LSH bucket.
+
+    Each band of the signatures is hashed to a bucket key; when blocks are given the key
+    also includes the block, so rows are only compared within the same block. Finding
+    the buckets is a sort of the keys, so the cost grows close to linearly with the rows.
+    Within a bucket of more than MAX_BUCKET_PAIRS + 1 rows, a row is only paired with the
+    MAX_BUCKET_PAIRS rows that follow it, which still links the whole bucket.
+
+    Parameters
+    ----------
+    signatures : np.ndarray
+        The MinHash signatures.
+    bands : int
+        The number of bands.
+    blocks : np.ndarray, optional
+        A uint64 block key for each row. The default is None.
+
+    Returns
+    -------
+    np.ndarray
+        An int64 array of shape (pairs, 2), with the lower position first.
+    """
+    n, num_perm = signatures.shape
+    width = num_perm // bands
+    pairs = []
+    for band in range(bands):
+        keys = pd.util.hash_pandas_object(pd.DataFrame(signatures[:, band * width:(band + 1) * width]), index=False).to_numpy()
+        if blocks is not None:
+            keys = pd.util.hash_pandas_object(pd.DataFrame({"key": keys, "block": blocks}), index=False).to_numpy()
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        #rows at this distance in the sorted keys are in the same bucket if their keys match
+        for distance in range(1, MAX_BUCKET_PAIRS + 1):
+            same = np.flatnonzero(sorted_keys[distance:] == sorted_keys[:-distance])
+            if len(same) == 0:
+                break
+            pairs.append(np.column_stack((order[same], order[same + distance])))
+
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(pairs), axis=1)
+    return np.unique(pairs, axis=0)
+
+def cluster_pairs(n, pairs):
+    """
+    Groups rows linked by pairs into clusters (connected components).
+
+    Returns
+    -------
+    np.ndarray
+        The cluster label of each of the n rows, the smallest position in its cluster.
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    graph = coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(n, n))
+    _, components = connected_components(graph, directed=False)
+    first = np.full(components.max() + 1 if n else 0, n, dtype=np.int64)
+    np.minimum.at(first, components, np.arange(n))
+    return first[components]
+
+def find_near_duplicates(frame, threshold=THRESHOLD, num_perm=NUM_PERM, ngram=NGRAM, blocks=None, seed=0):
+    """
+    Finds clusters of near-duplicate rows with MinHash and locality sensitive hashing.
+
+    Rows whose key columns are all missing or empty have no text to compare: they get
+    no signature and are never part of a cluster.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        The key columns to be compared.
+    threshold : float, optional
+        The minimum estimated Jaccard similarity of the n-grams of two linked rows.
+        The default is THRESHOLD.
+    num_perm : int, optional
+        The signature length. The default is NUM_PERM.
+    ngram : int, optional
+        The length of the character n-grams. The default is NGRAM.
+    blocks : pd.DataFrame or pd.Series, optional
+        Blocking columns; only rows with equal blocking values are compared.
+        The default is None.
+    seed : int, optional
+        The seed of the hash functions. The default is 0.
+
+    Returns
+    -------
+    pd.DataFrame
+        One line per row that belongs to a cluster of two rows or more, with the
+        'position' of the row, its 'cluster' (the position of the first row of the
+        cluster) and its estimated 'similarity' to that first row.
+    """
+    texts = normalize_text(frame)
+    keyed = np.flatnonzero(texts.to_numpy() != "")
+    if len(keyed) == 0:
+        return pd.DataFrame({"position": np.empty(0, dtype=np.int64), "cluster": np.empty(0, dtype=np.int64),
+                             "similarity": np.empty(0)})
+
+    #from here on the rows are numbered among the keyed rows only
+    signatures = minhash_signatures(texts.iloc[keyed], num_perm, ngram, seed)
+    block_keys = None
+    if blocks is not None:
+        block_keys = pd.util.hash_pandas_object(pd.DataFrame(blocks).iloc[keyed], index=False).to_numpy()
+
+    pairs = candidate_pairs(signatures, lsh_bands(num_perm, threshold), block_keys)
+    similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+    labels = cluster_pairs(len(keyed), pairs[similarity >= threshold])
+
+    sizes = np.bincount(labels, minlength=len(keyed))
+    members = np.flatnonzero(sizes[labels] > 1)
+    clusters = labels[members]
+    return pd.DataFrame({
+        "position": keyed[members],
+        "cluster": keyed[clusters],
+        "similarity": (signatures[members] == signatures[clusters]).mean(axis=1),
+    })
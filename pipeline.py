@@ -0,0 +1,291 @@
+import json
+import numpy as np
+import pandas as pd
+
+from typeInference import SAMPLE_SIZE, is_text
+
+PIPELINE_VERSION = 1
+
+#steps that can be applied batch by batch to a streamed DataFrame
+STREAMING_STEPS = ("fill_missing_values", "remove_NaN", "remove_duplicates", "filter_rows")
+
+#steps that never turn a present value into a missing one
+NAN_SAFE_STEPS = ("fill_missing_values", "remove_NaN", "remove_duplicates", "handle_outliers")
+
+#steps that only remove rows
+ROW_FILTERS = ("remove_NaN", "remove_duplicates")
+
+class Pipeline:
+    """
+    A lazy cleaning recipe: the cleaning steps are recorded into a plan instead of being
+    run one after the other, and the plan is optimized before it is executed.
+
+    The recording methods mirror the cleaning methods of cleanData.DataFrame and return
+    the pipeline, so steps can be chained:
+
+        Pipeline().remove_formatting().remove_NaN().remove_duplicates().run(frame)
+
+    The plan only holds JSON values, so it can be saved once and replayed on every new
+    file with the same schema.
+    """
+    def __init__(self, steps=None):
+        self.steps = [dict(step) for step in steps or []]
+
+    def remove_formatting(self, formats=None, sample_size=SAMPLE_SIZE):
+        """Records DataFrame.remove_formatting."""
+        return self._record("remove_formatting", formats=formats, sample_size=sample_size)
+
+    def fill_column_missing_values(self, column, method="mean"):
+        """Records DataFrame.fill_column_missing_values."""
+        return self._record("fill_missing_values", methods={column: method})
+
+    def fill_missing_values(self, methods):
+        """Records DataFrame.fill_missing_values."""
+        return self._record("fill_missing_values", methods=dict(methods))
+
+    def remove_NaN(self):
+        """Records DataFrame.remove_NaN."""
+        return self._record("remove_NaN")
+
+    def remove_duplicates(self, subset=None):
+        """Records DataFrame.remove_duplicates."""
+        return self._record("remove_duplicates", subset=list(subset) if subset is not None else None)
+
+    def handle_outliers(self, method="median", detection="zscore", threshold=None):
+        """
+        Records DataFrame.detect_outliers with the detection method and threshold,
+        followed by DataFrame.handle_outliers with method.
+        """
+        return self._record("handle_outliers", method=method, detection=detection, threshold=threshold)
+
+    def _record(self, step, **params):
+        self.steps.append({"step": step, **params})
+        return self
+
+    def optimize(self):
+        """
+        Returns the optimized plan of the recorded steps.
+
+        The rewrites keep the result of the plan unchanged:
+        - A remove_NaN that follows remove_formatting is also run before it, marked as
+          'pushed', so the rows with missing values are dropped before the string
+          transforms. It is still run after it too, as parsing turns blank strings into
+          missing values. The types remove_formatting infers and its fallback to a
+          string column depend on every row it sees, so the pushed remove_NaN only runs
+          when the formats of the remove_formatting step fix every text column to the
+          'string' type, which is converted value by value (see _formats_fixed).
+        - Redundant steps are dropped: a remove_NaN when no missing value can have
+          appeared since the last remove_NaN, a fill that cannot change the data then
+          (only 'zero' fills: 'fill' casts the column to object and a fractional mean or
+          median casts an integer column to float even with nothing to fill), and a
+          remove_duplicates repeated with the same subset with only row filters in between.
+        - Consecutive fills are fused into one fill_missing_values step, and consecutive
+          row filters into one filter_rows step that builds a single row mask.
+
+        Returns
+        -------
+        list
+            The steps of the optimized plan.
+        """
+        return _fuse(_drop_redundant(_push_filters(self.steps)))
+
+    def explain(self):
+        """
+        Describes the optimized plan, one line per step.
+
+        Returns
+        -------
+        str
+            The description of the plan.
+        """
+        lines = []
+        for i, step in enumerate(self.optimize(), 1):
+            params = ", ".join(f"{key}={value!r}" for key, value in step.items() if key != "step")
+            lines.append(f"{i}. {step['step']}({params})")
+        return "\n".join(lines)
+
+    def run(self, frame):
+        """
+        Executes the optimized plan on a DataFrame, in place.
+
+        In streaming mode the row filters and fills are applied batch by batch; if the
+        plan holds steps that need the whole data (remove_formatting, handle_outliers),
+        the data is loaded right before the first of them, so the filters pushed ahead
+        of it already shrink what is loaded.
+
+        Parameters
+        ----------
+        frame : cleanData.DataFrame
+            The DataFrame to be cleaned.
+
+        Returns
+        -------
+        cleanData.DataFrame
+            The cleaned DataFrame.
+        """
+        for step in self.optimize():
+            if frame.streaming and step["step"] not in STREAMING_STEPS:
+                frame.load()
+
+            if step["step"] == "remove_formatting":
+                frame.remove_formatting(step["formats"], step["sample_size"])
+            elif step["step"] == "fill_missing_values":
+                frame.fill_missing_values(step["methods"])
+            elif step["step"] == "filter_rows":
+                _filter_rows(frame, step["filters"])
+            elif step["step"] == "handle_outliers":
+                frame.detect_outliers(step["detection"], step["threshold"])
+                frame.handle_outliers(method=step["method"])
+            else:
+                raise ValueError(f"Invalid pipeline step {step['step']}")
+        return frame
+
+    def to_json(self):
+        """Returns the recorded steps as a JSON string."""
+        return json.dumps({"version": PIPELINE_VERSION, "steps": self.steps}, indent=4)
+
+    @classmethod
+    def from_json(cls, text):
+        """Builds a pipeline from a JSON string written by to_json."""
+        plan = json.loads(text)
+        if plan.get("version") != PIPELINE_VERSION:
+            raise ValueError("Unsupported pipeline version")
+        return cls(plan["steps"])
+
+    def save(self, filename="pipeline.json"):
+        """
+        Saves the recorded steps to a JSON file.
+
+        Parameters
+        ----------
+        filename : str, optional
+            The path of the file. The default is "pipeline.json".
+
+        Returns
+        -------
+        None
+        """
+        with open(filename, "w") as f:
+            f.write(self.to_json())
+
+    @classmethod
+    def load(cls, filename="pipeline.json"):
+        """
+        Loads a pipeline saved with save.
+
+        Parameters
+        ----------
+        filename : str, optional
+            The path of the file. The default is "pipeline.json".
+
+        Returns
+        -------
+        Pipeline
+            The loaded pipeline.
+        """
+        with open(filename, "r") as f:
+            return cls.from_json(f.read())
+
+def _push_filters(steps):
+    steps = [dict(step) for step in steps]
+    pushed = []
+    for step in steps:
+        if step["step"] == "remove_NaN":
+            #walk back over the filters that commute with remove_NaN
+            j = len(pushed)
+            while j > 0 and pushed[j - 1]["step"] == "remove_duplicates" and pushed[j - 1]["subset"] is None:
+                j -= 1
+            #without formats the inferred types depend on the rows, see _formats_fixed
+            if j > 0 and pushed[j - 1]["step"] == "remove_formatting" and pushed[j - 1]["formats"] is not None:
+                pushed.insert(j - 1, {"step": "remove_NaN", "pushed": True, "formats": pushed[j - 1]["formats"]})
+        pushed.append(step)
+    return pushed
+
+def _drop_redundant(steps):
+    kept = []
+    no_missing = False  # True while no missing value can exist
+    for step in steps:
+        name = step["step"]
+        if name == "remove_NaN" and no_missing and "pushed" not in step:
+            continue
+        if name == "fill_missing_values" and no_missing and set(step["methods"].values()) <= {"zero"}:
+            continue
+        if name == "remove_duplicates" and _repeats_dedupe(kept, step["subset"]):
+            continue
+        kept.append(step)
+        #a pushed remove_NaN may be skipped at run time
+        no_missing = (name == "remove_NaN" and "pushed" not in step) or (no_missing and name in NAN_SAFE_STEPS)
+    return kept
+
+def _repeats_dedupe(kept, subset):
+    for step in reversed(kept):
+        if step["step"] == "remove_duplicates" and step["subset"] == subset:
+            return True
+        if step["step"] not in ROW_FILTERS:
+            return False
+    return False
+
+def _fuse(steps):
+    fused = []
+    for step in steps:
+        last = fused[-1] if fused else None
+        if step["step"] == "fill_missing_values":
+            if last is not None and last["step"] == "fill_missing_values" and not set(step["methods"]) & set(last["methods"]):
+                last["methods"].update(step["methods"])
+                continue
+            step = {"step": "fill_missing_values", "methods": dict(step["methods"])}
+        elif step["step"] in ROW_FILTERS:
+            if last is not None and last["step"] == "filter_rows":
+                last["filters"].append(step)
+                continue
+            step = {"step": "filter_rows", "filters": [step]}
+        fused.append(step)
+    return fused
+
+def _filter_rows(frame, filters):
+    """
+    Applies consecutive remove_NaN and remove_duplicates steps with a single row mask, so
+    the rows are copied once at the end instead of once per step.
+    """
+    filters = [step for step in filters if "pushed" not in step or _formats_fixed(frame, step["formats"])]
+    if frame.streaming:
+        for step in filters:
+            if step["step"] == "remove_NaN":
+                frame.remove_NaN()
+            else:
+                frame.remove_duplicates(step["subset"])
+        return
+
+    df = frame.df
+    keep = np.ones(len(df), dtype=bool)
+    for step in filters:
+        if step["step"] == "remove_NaN":
+            keep &= df.notna().all(axis=1).to_numpy()
+        else:
+            rows = np.flatnonzero(keep)
+            columns = df[step["subset"]] if step["subset"] is not None else df
+            keep[rows[columns.iloc[rows].duplicated().to_numpy()]] = False
+    frame._invalidate_profile()
+    frame.df = df[keep]
+
+def _formats_fixed(frame, formats):
+    """
+    Checks that formats fix every text column of frame to the 'string' type. Its
+    conversion is made value by value, so dropping rows before remove_formatting then
+    leaves the other rows unchanged; the other types are inferred from a sample of the
+    rows and fall back to 'string' if any row does not parse, and compaction chooses
+    the dtypes from the rows too.
+    """
+    if formats is None or frame.compact_dtypes:
+        return False
+    if isinstance(formats, str):
+        with open(formats, "r") as f:
+            formats = json.load(f)
+    df = next(frame.iter_batches(), None) if frame.streaming else frame.df
+    if df is None:
+        return True
+    for col in df.columns:
+        if (is_text(df[col]) or isinstance(df[col].dtype, pd.CategoricalDtype)) and \
+                formats.get(str(col), {}).get("kind") != "string":
+            return False
+    return True
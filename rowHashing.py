@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+MAX_EXACT_INTEGER = 2**53  # larger integers do not all survive a float64 conversion
+
+def canonical_rows(frame):
+    """
+    Returns the rows of frame in dtypes that do not depend on the batch they come from.
+
+    The chunked readers infer the dtypes of every batch on its own, and so do appended
+    batches: an integer column is read as float in a batch with a missing value and a
+    boolean column as object. Equal rows then hash differently. Here the integer and
+    float columns become float64 (integers only when they are exact as floats, and -0.0
+    becomes 0.0), and the boolean, text and category columns become object.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        The rows.
+
+    Returns
+    -------
+    pd.DataFrame
+        The rows with canonical dtypes, with the index and the columns of frame.
+    """
+    columns = {}
+    for j in range(frame.shape[1]):
+        series = frame.iloc[:, j]
+        if pd.api.types.is_bool_dtype(series) or not pd.api.types.is_numeric_dtype(series):
+            columns[j] = series.astype(object)
+        elif pd.api.types.is_complex_dtype(series):
+            columns[j] = series
+        else:
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan) + 0.0
+            exact = not pd.api.types.is_integer_dtype(series) or not (np.abs(values) >= MAX_EXACT_INTEGER).any()
+            columns[j] = values if exact else series
+    canonical = pd.DataFrame(columns, index=frame.index)
+    canonical.columns = frame.columns
+    return canonical
+
+def hash_rows(frame):
+    """
+    Returns the 64-bit hash of each row of frame, equal for rows that are equal whatever
+    the dtypes of their batch (see canonical_rows). Missing values hash the same, as
+    DataFrame.duplicated treats them as equal.
+    """
+    return pd.util.hash_pandas_object(canonical_rows(frame), index=False).to_numpy()
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+from rowHashing import hash_rows
+
+class RunningStats:
+    """
+    Statistics of a DataFrame that grows by appended batches, updated in time
+    proportional to each batch.
+
+    - Duplicates: the 64-bit hash of every distinct row seen so far is kept in a set, so
+      a new row is a duplicate if its hash is already known. Rows are hashed in
+      canonical dtypes with rowHashing.hash_rows, so a batch whose integer column
+      turned to float (e.g. because of a missing value) still matches the history, and
+      missing values are equal as in DataFrame.duplicated.
+    - Missing values: a null counter per column.
+    - Z-scores: the count, mean and sum of squared deviations (M2) of every numerical
+      column, merged batch by batch with Chan's parallel form of Welford's algorithm,
+      which stays accurate where sum and sum of squares would cancel out.
+    """
+    def __init__(self):
+        self.n_rows = 0
+        self.duplicates = 0
+        self.row_hashes = set()
+        self.missing = pd.Series(dtype="int64")
+        self.count = pd.Series(dtype="int64")
+        self.mean = pd.Series(dtype=float)
+        self.m2 = pd.Series(dtype=float)
+
+    def duplicated(self, batch):
+        """
+        Returns a boolean array, True for the rows of batch that repeat a row seen
+        before, in the history or earlier in the batch.
+        """
+        hashes = hash_rows(batch)
+        known = np.fromiter(map(self.row_hashes.__contains__, hashes.tolist()), dtype=bool, count=len(hashes))
+        return known | pd.Series(hashes).duplicated().to_numpy()
+
+    def update(self, batch, duplicated=None):
+        """
+        Adds the rows of batch to the statistics.
+
+        Parameters
+        ----------
+        batch : pd.DataFrame
+            The new rows.
+        duplicated : np.ndarray, optional
+            The result of duplicated(batch), if already computed. The default is None.
+
+        Returns
+        -------
+        None
+        """
+        if duplicated is None:
+            duplicated = self.duplicated(batch)
+        hashes = hash_rows(batch[~duplicated])
+        self.row_hashes.update(hashes.tolist())
+        self.duplicates += int(duplicated.sum())
+        self.n_rows += len(batch)
+        self.missing = self.missing.add(batch.isnull().sum(), fill_value=0).astype("int64")
+
+        numeric = batch.select_dtypes(include="number").astype(float)
+        count_b = numeric.count()
+        mean_b = numeric.mean()
+        m2_b = ((numeric - mean_b) ** 2).sum()
+
+        count_a = self.count.reindex(count_b.index, fill_value=0)
+        mean_a = self.mean.reindex(count_b.index, fill_value=0.0)
+        m2_a = self.m2.reindex(count_b.index, fill_value=0.0)
+        count = count_a + count_b
+        delta = (mean_b - mean_a).fillna(0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = (mean_a + delta * count_b / count).where(count > 0, 0.0)
+            m2 = (m2_a + m2_b + delta ** 2 * count_a * count_b / count).where(count > 0, 0.0)
+
+        self.count = count.combine_first(self.count).astype("int64")
+        self.mean = mean.combine_first(self.mean)
+        self.m2 = m2.combine_first(self.m2)
+
+    def zscore_bounds(self, columns, threshold):
+        """
+        Returns the z-score outlier bounds of columns from the running mean and
+        standard deviation, as the lower and upper Series.
+        """
+        count = self.count.reindex(columns, fill_value=0)
+        mean = self.mean.reindex(columns)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(self.m2.reindex(columns) / count)
+        valid = std > 0
+        lower = (mean - threshold * std).where(valid, -np.inf).astype(float)
+        upper = (mean + threshold * std).where(valid, np.inf).astype(float)
+        return lower, upper
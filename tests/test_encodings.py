@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+import cleanData as cd
+
+MIXED = pd.DataFrame({
+    "mixed": pd.Series([1, "x", "y", 1, 2.5, "x"], dtype=object),
+    "text": ["a", "b", "a", "c", "b", "a"],
+    "flag": [True, False, True, True, False, True],
+})
+
+def test_saved_encodings_give_the_same_codes(tmp_path):
+    path = str(tmp_path / "encodings.npz")
+    fitted = cd.DataFrame(df=MIXED.copy())
+    fitted.categorical_to_numeric(filename=path)
+
+    reloaded = cd.DataFrame(df=MIXED.copy())
+    reloaded.categorical_to_numeric(path)
+    pd.testing.assert_frame_equal(reloaded.df, fitted.df)
+    assert list(reloaded.encodings["mixed"]) == [1, 2.5, "x", "y"]
+
+def test_unseen_values_get_the_reserved_code(tmp_path):
+    path = str(tmp_path / "encodings.npz")
+    cd.DataFrame(df=MIXED.copy()).categorical_to_numeric(filename=path)
+    batch = cd.DataFrame(df=pd.DataFrame({"mixed": pd.Series([1, "z"], dtype=object), "text": ["c", "d"]}))
+    batch.categorical_to_numeric(path)
+    assert batch.df["mixed"].tolist() == [0, cd.UNSEEN_CODE]
+    assert batch.df["text"].tolist() == [2, cd.UNSEEN_CODE]
+
+def test_categories_that_cannot_be_saved_raise(tmp_path):
+    frame = cd.DataFrame(df=pd.DataFrame({"when": pd.Series([pd.Timestamp("2024-01-01"), "x"], dtype=object)}))
+    frame.categorical_to_numeric()
+    with pytest.raises(ValueError):
+        frame.save_encodings(str(tmp_path / "encodings.npz"))
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import cleanData as cd
+from pipeline import Pipeline
+
+def run_eagerly(pipeline, df):
+    """Runs the recorded steps one after the other, without optimizing the plan."""
+    frame = cd.DataFrame(df=df.copy())
+    for step in pipeline.steps:
+        if step["step"] == "remove_formatting":
+            frame.remove_formatting(step["formats"], step["sample_size"])
+        elif step["step"] == "fill_missing_values":
+            frame.fill_missing_values(step["methods"])
+        elif step["step"] == "remove_NaN":
+            frame.remove_NaN()
+        elif step["step"] == "remove_duplicates":
+            frame.remove_duplicates(step["subset"])
+        elif step["step"] == "handle_outliers":
+            frame.detect_outliers(step["detection"], step["threshold"])
+            frame.handle_outliers(method=step["method"])
+    return frame.df
+
+def run_optimized(pipeline, df):
+    return pipeline.run(cd.DataFrame(df=df.copy())).df
+
+MIXED = pd.DataFrame({
+    "name": ["Ann Lee", "Bob", "Bob", None, "Eve Moss", "Ann Lee", "Zed"],
+    "price": ["$1,200", "30", "30", "15", "n/a", "$1,200", ""],
+    "active": ["yes", "no", "no", "yes", None, "yes", "no"],
+    "day": ["2024-01-02", "2024-02-03", "2024-02-03", "2024-03-04", "2024-04-05", "2024-01-02", None],
+    "count": [1, 2, 2, 3, 4, 1, 5],
+    "score": [0.5, np.nan, np.nan, 2.5, 100.0, 0.5, 1.5],
+})
+
+STRING_FORMATS = {col: {"kind": "string"} for col in ("name", "price", "active", "day")}
+
+PLANS = {
+    "format then drop": Pipeline().remove_formatting().remove_NaN(),
+    "format, dedupe, drop, dedupe": Pipeline().remove_formatting().remove_duplicates().remove_NaN().remove_duplicates(),
+    "fill after drop": Pipeline().remove_NaN().fill_missing_values({"score": "fill", "count": "mean"}),
+    "zero fill after drop": Pipeline().remove_NaN().fill_column_missing_values("score", "zero"),
+    "fills fused": Pipeline().fill_column_missing_values("score", "median").fill_column_missing_values("count", "zero"),
+    "outliers": Pipeline().remove_formatting().remove_NaN().handle_outliers("clip", "iqr"),
+    "fixed string formats": Pipeline().remove_formatting(STRING_FORMATS).remove_duplicates().remove_NaN(),
+    "fixed numeric format": Pipeline().remove_formatting({"price": {"kind": "numeric", "thousands": ",", "decimal": ".",
+                                                                     "currency": True}}).remove_NaN(),
+}
+
+@pytest.mark.parametrize("name", PLANS)
+def test_optimized_run_matches_eager_run(name):
+    pipeline = PLANS[name]
+    pd.testing.assert_frame_equal(run_optimized(pipeline, MIXED), run_eagerly(pipeline, MIXED))
+
+def test_filter_not_pushed_when_types_are_inferred():
+    #dropping the row of "abc" first would make 'a' a numeric column
+    df = pd.DataFrame({"a": ["1", "2", "abc", "4"], "b": [1, 2, np.nan, 4]})
+    pipeline = Pipeline().remove_formatting().remove_NaN()
+    assert [step["step"] for step in pipeline.optimize()] == ["remove_formatting", "filter_rows"]
+    result = run_optimized(pipeline, df)
+    pd.testing.assert_frame_equal(result, run_eagerly(pipeline, df))
+    assert list(result["a"]) == ["1", "2", "4"]
+
+def test_filter_pushed_only_when_formats_are_fixed_strings():
+    df = pd.DataFrame({"a": ["1", "2", "abc", "4"], "b": [1, 2, np.nan, 4]})
+    pipeline = Pipeline().remove_formatting({"a": {"kind": "numeric", "thousands": ",", "decimal": ".",
+                                                   "currency": False}}).remove_NaN()
+    assert pipeline.optimize()[0]["filters"][0]["pushed"]
+    pd.testing.assert_frame_equal(run_optimized(pipeline, df), run_eagerly(pipeline, df))
+
+    pipeline = Pipeline().remove_formatting({"a": {"kind": "string"}}).remove_NaN()
+    frame = cd.DataFrame(df=df.copy())
+    shapes = []
+    frame.remove_formatting = lambda *args: shapes.append(frame.df.shape) or cd.DataFrame.remove_formatting(frame, *args)
+    pipeline.run(frame)
+    assert shapes == [(3, 2)]
+    pd.testing.assert_frame_equal(frame.df, run_eagerly(pipeline, df))
+
+def test_redundant_steps_dropped():
+    plan = Pipeline().remove_NaN().remove_duplicates().remove_NaN().remove_duplicates() \
+        .fill_column_missing_values("score", "zero").fill_column_missing_values("score", "fill").optimize()
+    assert plan == [
+        {"step": "filter_rows", "filters": [{"step": "remove_NaN"}, {"step": "remove_duplicates", "subset": None}]},
+        {"step": "fill_missing_values", "methods": {"score": "fill"}},
+    ]
+
+def test_json_round_trip(tmp_path):
+    pipeline = Pipeline().remove_formatting(STRING_FORMATS).remove_NaN().fill_missing_values({"score": "mean"})
+    pipeline.save(str(tmp_path / "pipeline.json"))
+    loaded = Pipeline.load(str(tmp_path / "pipeline.json"))
+    assert loaded.steps == pipeline.steps
+    assert loaded.optimize() == pipeline.optimize()
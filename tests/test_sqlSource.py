@@ -0,0 +1,84 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import cleanData as cd
+import sqlSource
+
+ROWS = pd.DataFrame({
+    "id": range(10),
+    "city": ["Paris", "Rome", "Lisbon", "Paris", "Rome", "Lisbon", "Paris", "Rome", "Lisbon", "Paris"],
+    "amount": [float(i * 10) for i in range(10)],
+})
+
+@pytest.fixture
+def url(tmp_path):
+    path = tmp_path / "data.db"
+    with sqlite3.connect(path) as connection:
+        ROWS.to_sql("sales", connection, index=False)
+    return f"sqlite:///{path}"
+
+def test_table(url):
+    frame = cd.DataFrame(connection_url=url, table="sales")
+    pd.testing.assert_frame_equal(frame.df, ROWS)
+
+def test_query(url):
+    frame = cd.DataFrame(connection_url=url, query="SELECT id, city FROM sales WHERE amount >= 50")
+    assert list(frame.df.columns) == ["id", "city"]
+    assert list(frame.df["id"]) == [5, 6, 7, 8, 9]
+
+def test_sql_file_with_trailing_semicolon(url, tmp_path):
+    path = tmp_path / "query.sql"
+    path.write_text("SELECT *\nFROM sales\nWHERE city = 'Rome';\n\n")
+    frame = cd.DataFrame(str(path), connection_url=url)
+    assert list(frame.df["id"]) == [1, 4, 7]
+
+def test_query_with_trailing_comment(url):
+    frame = cd.DataFrame(connection_url=url, query="SELECT * FROM sales -- every row", filters=[("id", "<", 2)])
+    assert list(frame.df["id"]) == [0, 1]
+
+def test_column_and_filter_pushdown(url):
+    statement = sqlSource.build_query(table="sales", columns=["id", "amount"],
+                                      filters=[("city", "in", ["Paris", "Rome"]), ("amount", ">", 20)])
+    sql = str(statement.compile())
+    assert "WHERE" in sql and "city IN" in sql and "amount >" in sql
+    assert sql.startswith("SELECT id, amount")
+
+    frame = cd.DataFrame(connection_url=url, table="sales", columns=["id", "amount"],
+                         filters=[("city", "in", ["Paris", "Rome"]), ("amount", ">", 20)])
+    expected = ROWS[ROWS["city"].isin(["Paris", "Rome"]) & (ROWS["amount"] > 20)][["id", "amount"]]
+    pd.testing.assert_frame_equal(frame.df, expected.reset_index(drop=True))
+
+def test_filters_on_query(url):
+    frame = cd.DataFrame(connection_url=url, query="SELECT * FROM sales;", filters=[("city", "==", "Lisbon")])
+    assert list(frame.df["id"]) == [2, 5, 8]
+
+def test_invalid_source_and_operator():
+    with pytest.raises(ValueError):
+        sqlSource.build_query()
+    with pytest.raises(ValueError):
+        sqlSource.build_query(table="sales", query="SELECT 1")
+    with pytest.raises(ValueError):
+        sqlSource.build_query(table="sales", filters=[("id", "~", 1)])
+
+def test_chunked_reads(url):
+    frame = cd.DataFrame(connection_url=url, table="sales", chunksize=3)
+    assert frame.streaming
+    batches = list(frame.iter_batches())
+    assert [len(batch) for batch in batches] == [3, 3, 3, 1]
+    assert list(pd.concat(batches).index) == list(range(10))
+    assert frame.get_missing_value().sum() == 0
+
+    frame.load()
+    pd.testing.assert_frame_equal(frame.df, ROWS)
+
+def test_engine_reuse(url):
+    engine = sqlSource.get_engine(url)
+    assert sqlSource.get_engine(url) is engine
+
+    cd.DataFrame(connection_url=url, table="sales")
+    list(cd.DataFrame(connection_url=url, table="sales", chunksize=4).iter_batches())
+    assert sqlSource.get_engine(url) is engine
+    #every connection went back to the pool
+    assert engine.pool.checkedout() == 0
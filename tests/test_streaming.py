@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import cleanData as cd
+from loadCache import LoadCache
+
+#'a' is read as numbers in the first batches and as text in the last one, 'c' is all
+#missing in the first batches and 'd' is boolean with a missing value
+ROWS = "a,b,c,d\n1,1,,True\n2,2,,False\n3,,,\n4,4,x,True\nfoo,5,,False\n"
+
+@pytest.fixture
+def files(tmp_path):
+    csv = tmp_path / "data.csv"
+    csv.write_text(ROWS)
+    df = pd.read_csv(csv)
+    jsonl = tmp_path / "data.jsonl"
+    df.to_json(jsonl, orient="records", lines=True)
+    paths = [str(csv), str(jsonl)]
+    try:
+        xlsx = tmp_path / "data.xlsx"
+        df.to_excel(xlsx, index=False)
+        paths.append(str(xlsx))
+    except ImportError:
+        pass
+    return paths
+
+def in_memory(path):
+    return cd.DataFrame(path, cache=False)
+
+@pytest.fixture(autouse=True)
+def no_user_cache(monkeypatch):
+    monkeypatch.setenv("DCA_CACHE", "0")
+
+@pytest.mark.parametrize("chunksize", [1, 2, 3])
+def test_loaded_batches_match_the_whole_file(files, chunksize):
+    for path in files:
+        frame = cd.DataFrame(path, chunksize=chunksize)
+        pd.testing.assert_frame_equal(frame.load(), in_memory(path).df, check_column_type=False)
+
+def test_remove_formatting_after_load(files):
+    for path in files:
+        frame = cd.DataFrame(path, chunksize=2)
+        frame.load()
+        frame.remove_formatting()
+        expected = in_memory(path)
+        expected.remove_formatting()
+        pd.testing.assert_frame_equal(frame.df, expected.df, check_column_type=False)
+
+def test_to_csv(files, tmp_path):
+    for path in files:
+        cd.DataFrame(path, chunksize=2).to_csv(tmp_path / "streamed.csv")
+        in_memory(path).to_csv(tmp_path / "in_memory.csv")
+        assert (tmp_path / "streamed.csv").read_text() == (tmp_path / "in_memory.csv").read_text()
+
+def test_mean_fill_of_text_column_missing_in_first_batch(files):
+    for path in files:
+        frame = cd.DataFrame(path, chunksize=2)
+        frame.fill_column_missing_values("c", "mean")
+        frame.fill_column_missing_values("b", "mean")
+        expected = in_memory(path)
+        expected.fill_column_missing_values("c", "mean")
+        expected.fill_column_missing_values("b", "mean")
+        pd.testing.assert_frame_equal(frame.load(), expected.df, check_column_type=False)
+
+def test_batch_schema():
+    batches = [pd.DataFrame({"n": [1, 2], "b": [True, False]}),
+               pd.DataFrame({"n": [np.nan, np.nan], "b": [None, True]})]
+    dtypes, text = cd.batch_schema(batches)
+    assert dtypes == {"n": np.dtype(np.float64), "b": np.dtype(object)}
+    assert text == {}
+
+def test_duplicates_across_batches_read_as_numbers_and_text(tmp_path):
+    #the second '1,x' is in a batch where 'a' holds text
+    path = tmp_path / "duplicates.csv"
+    path.write_text("a,b\n1,x\n2,y\n1,x\nfoo,v\n")
+    frame = cd.DataFrame(str(path), chunksize=2)
+    assert frame.get_amount_duplicates() == in_memory(str(path)).get_amount_duplicates() == 1
+    frame.remove_duplicates()
+    assert frame.load().index.tolist() == [0, 1, 3]
+
+def test_fill_turns_every_batch_to_object(tmp_path):
+    path = tmp_path / "fill.csv"
+    path.write_text("a,b\n1,x\n,y\n1,x\n3,z\n")
+    frame = cd.DataFrame(str(path), chunksize=2)
+    frame.fill_column_missing_values("a", "fill")
+    expected = in_memory(str(path))
+    expected.fill_column_missing_values("a", "fill")
+    assert [batch["a"].dtype for batch in frame.iter_batches()] == [np.dtype(object)] * 2
+    assert frame.get_amount_duplicates() == expected.get_amount_duplicates() == 1
+    pd.testing.assert_frame_equal(frame.load(), expected.df, check_column_type=False)
+
+def test_streamed_file_is_cached_once_loaded(files, tmp_path, monkeypatch):
+    monkeypatch.setenv("DCA_CACHE", "1")
+    pytest.importorskip("pyarrow")
+    cache = LoadCache(str(tmp_path / "cache"))
+    for path in files:
+        first = cd.DataFrame(path, chunksize=2, cache=cache)
+        assert cache.read_batches(path, 2) is None
+        first.load()
+
+        batches = cache.read_batches(path, 2)
+        assert batches is not None
+        pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True), in_memory(path).df, check_column_type=False)
+        pd.testing.assert_frame_equal(cd.DataFrame(path, chunksize=2, cache=cache).load(), in_memory(path).df,
+                                      check_column_type=False)
+        pd.testing.assert_frame_equal(cd.DataFrame(path, cache=cache).df, in_memory(path).df, check_column_type=False)
+
+def test_streamed_excel_gives_nan_for_empty_cells(tmp_path):
+    pytest.importorskip("openpyxl")
+    path = str(tmp_path / "mixed.xlsx")
+    pd.DataFrame({"m": [1, "x", None, True]}).to_excel(path, index=False)
+    #assert_frame_equal takes None and NaN as equal
+    value = cd.DataFrame(path, chunksize=2).load()["m"][2]
+    assert type(value) is type(in_memory(path).df["m"][2]) is float
@@ -0,0 +1,313 @@
+import cProfile
+import functools
+import inspect
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+MEMORY_MODES = ("rss", "tracemalloc", None)
+
+_active = None
+_local = threading.local()
+
+def instrument(cls):
+    """
+    Wraps every public method of a class so its calls are recorded by a Tracer.
+
+    A call is recorded by the tracer of the instance (its 'tracer' attribute) or, if it
+    has none, by the tracer activated with a with block. With no tracer the wrapper
+    only adds an attribute lookup to the call. Generator methods (e.g. iter_batches)
+    are left unwrapped, as their work happens while they are consumed.
+
+    Parameters
+    ----------
+    cls : type
+        The class to instrument.
+
+    Returns
+    -------
+    type
+        The class, instrumented in place.
+    """
+    for name, value in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(value) or inspect.isgeneratorfunction(value):
+            continue
+        setattr(cls, name, _traced(value))
+    return cls
+
+def _traced(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        tracer = getattr(self, "tracer", None) or _active
+        if tracer is None:
+            return method(self, *args, **kwargs)
+        return tracer.call(method, self, args, kwargs)
+    return wrapper
+
+def _shape(frame):
+    #DataFrame.shape counts the appended batches without concatenating them
+    return getattr(frame, "shape", (None, None))
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    #bytes on macOS, kilobytes elsewhere
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+class Tracer:
+    """
+    Records the calls of instrumented DataFrame methods.
+
+    Each call produces a record (a dictionary) with:
+    - 'method', 'depth' (0 for a call made by the user, 1 for a call made by another
+      method, ...), 'thread' and 'start' (seconds since the tracer was created).
+    - 'wall' and 'cpu': the wall clock and process CPU time, in seconds.
+    - 'memory': the growth of the memory peak during the call, in MB (see memory).
+    - 'rows_in', 'columns_in', 'rows_out', 'columns_out': the shape of the data before
+      and after the call, None while the data is streamed.
+    - 'rows_affected': the number of rows removed or added by the call.
+    - 'error': the exception raised by the call, if any.
+
+    The records are kept in self.records and passed to every hook as they are made.
+    The measures cost a few microseconds per call, so a tracer can be left on; cProfile
+    is only run for the methods listed in profile.
+
+    A tracer records the calls of the DataFrames it is given to (DataFrame(tracer=...))
+    or, inside a with block, the calls of every DataFrame.
+
+    Parameters
+    ----------
+    memory : str, optional
+        How the memory is measured:
+        'rss' - the growth of the peak resident set size of the process, a system call
+        per measure; it is 0 while the call stays under an earlier peak (default).
+        'tracemalloc' - the peak of the Python allocations during the call, exact but
+        it slows the allocations down while tracing; nested calls are not measured.
+        None - no memory measure.
+    profile : list, optional
+        The methods to run under cProfile. The default is None.
+    profile_every : int, optional
+        Only one call out of profile_every of a profiled method is run under cProfile.
+        The default is 1.
+    hooks : list, optional
+        Callables called with each record. The default is None.
+    """
+    def __init__(self, memory="rss", profile=None, profile_every=1, hooks=None):
+        if memory not in MEMORY_MODES:
+            raise ValueError("Invalid memory mode, expected 'rss', 'tracemalloc' or None")
+        if memory == "rss" and resource is None:
+            memory = None
+        self.memory = memory
+        self.profile = set(profile or [])
+        self.profile_every = profile_every
+        self.hooks = list(hooks or [])
+        self.records = []
+        self.profiles = {}
+        self._calls = {}
+        self._origin = time.perf_counter()
+        self._previous = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        """Adds a callable called with each record."""
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """Removes a hook added with add_hook."""
+        self.hooks.remove(hook)
+
+    def clear(self):
+        """Removes every record and profile."""
+        with self._lock:
+            self.records = []
+            self.profiles = {}
+            self._calls = {}
+
+    def __enter__(self):
+        global _active
+        self._previous.append(_active)
+        _active = self
+        return self
+
+    def __exit__(self, *exc_info):
+        global _active
+        _active = self._previous.pop()
+        return False
+
+    def call(self, method, frame, args, kwargs):
+        """
+        Runs a method of frame and records the call.
+        """
+        name = method.__name__
+        depth = getattr(_local, "depth", 0)
+        with self._lock:
+            calls = self._calls[name] = self._calls.get(name, 0) + 1
+        profiler = None
+        if name in self.profile and (calls - 1) % self.profile_every == 0 and not getattr(_local, "profiling", False):
+            profiler = cProfile.Profile()
+
+        measure_memory = self.memory == "rss" or (self.memory == "tracemalloc" and depth == 0)
+        if self.memory == "tracemalloc" and depth == 0:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0] / 1024**2
+        elif self.memory == "rss":
+            memory_before = _peak_rss_mb()
+
+        rows_in, columns_in = _shape(frame)
+        error = None
+        _local.depth = depth + 1
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            if profiler is not None:
+                _local.profiling = True
+                return profiler.runcall(method, frame, *args, **kwargs)
+            return method(frame, *args, **kwargs)
+        except BaseException as exception:
+            error = repr(exception)
+            raise
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.process_time() - cpu_start
+            _local.depth = depth
+            memory = None
+            if measure_memory and self.memory == "rss":
+                memory = _peak_rss_mb() - memory_before
+            elif measure_memory:
+                memory = tracemalloc.get_traced_memory()[1] / 1024**2 - memory_before
+                if started_tracing:
+                    tracemalloc.stop()
+            if profiler is not None:
+                _local.profiling = False
+                self._add_profile(name, profiler)
+
+            rows_out, columns_out = _shape(frame)
+            self._record({
+                "method": name,
+                "depth": depth,
+                "thread": threading.get_ident(),
+                "start": start - self._origin,
+                "wall": wall,
+                "cpu": cpu,
+                "memory": memory,
+                "rows_in": rows_in,
+                "columns_in": columns_in,
+                "rows_out": rows_out,
+                "columns_out": columns_out,
+                "rows_affected": abs(rows_out - rows_in) if rows_in is not None and rows_out is not None else None,
+                "error": error,
+            })
+
+    def _add_profile(self, name, profiler):
+        with self._lock:
+            if name in self.profiles:
+                self.profiles[name].add(profiler)
+            else:
+                self.profiles[name] = pstats.Stats(profiler, stream=io.StringIO())
+
+    def _record(self, record):
+        with self._lock:
+            self.records.append(record)
+        for hook in self.hooks:
+            hook(record)
+
+    def summary(self):
+        """
+        Returns the total wall and CPU time, memory growth and call count of each method.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per method, sorted by total wall time.
+        """
+        import pandas as pd
+
+        records = pd.DataFrame(self.records, columns=["method", "wall", "cpu", "memory", "rows_affected"])
+        summary = records.groupby("method").agg(
+            calls=("wall", "size"), wall=("wall", "sum"), cpu=("cpu", "sum"),
+            memory=("memory", "max"), rows_affected=("rows_affected", "sum"))
+        return summary.sort_values("wall", ascending=False)
+
+    def profile_report(self, method, n=20, sort="cumulative"):
+        """
+        Returns the cProfile report of a profiled method, as text.
+
+        Parameters
+        ----------
+        method : str
+            The name of the method.
+        n : int, optional
+            The number of functions listed. The default is 20.
+        sort : str, optional
+            The pstats sort key. The default is "cumulative".
+
+        Returns
+        -------
+        str
+            The report, empty if the method was not profiled.
+        """
+        stats = self.profiles.get(method)
+        if stats is None:
+            return ""
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats(sort).print_stats(n)
+        return stream.getvalue()
+
+    def to_json(self, filename="trace.json"):
+        """
+        Saves the records to a JSON file.
+
+        Parameters
+        ----------
+        filename : str, optional
+            The path of the file. The default is "trace.json".
+
+        Returns
+        -------
+        None
+        """
+        with open(filename, "w") as f:
+            json.dump(self.records, f, indent=4)
+
+    def to_chrome_trace(self, filename="trace.chrome.json"):
+        """
+        Saves the records in the Chrome trace event format, to be opened in
+        chrome://tracing or Perfetto. Nested calls show as nested slices.
+
+        Parameters
+        ----------
+        filename : str, optional
+            The path of the file. The default is "trace.chrome.json".
+
+        Returns
+        -------
+        None
+        """
+        events = []
+        for record in self.records:
+            events.append({
+                "name": record["method"],
+                "cat": "DataFrame",
+                "ph": "X",
+                "ts": record["start"] * 1e6,
+                "dur": record["wall"] * 1e6,
+                "pid": os.getpid(),
+                "tid": record["thread"],
+                "args": {key: value for key, value in record.items()
+                         if key not in ("method", "thread", "start", "wall")},
+            })
+        with open(filename, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
@@ -0,0 +1,200 @@
+import re
+import warnings
+import numpy as np
+import pandas as pd
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:
+    guess_datetime_format = None
+
+SAMPLE_SIZE = 1000
+
+DATETIME_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y/%m/%d",
+    "%d/%m/%Y",
+    "%m/%d/%Y",
+    "%d/%m/%Y %H:%M",
+    "%m/%d/%Y %H:%M",
+    "%d/%m/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M:%S",
+    "%d-%m-%Y",
+    "%m-%d-%Y",
+    "%d.%m.%Y",
+    "%d %b %Y",
+    "%d %B %Y",
+    "%b %d, %Y",
+    "%B %d, %Y",
+)
+
+BOOLEAN_VALUES = (
+    ("true", "false"),
+    ("yes", "no"),
+    ("y", "n"),
+    ("t", "f"),
+)
+
+CURRENCY_SYMBOLS = "$€£¥"
+
+#thousands separator, decimal separator and the pattern a value must fully match
+NUMERIC_PATTERNS = (
+    (",", ".", re.compile(r"[-+]?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?")),
+    (".", ",", re.compile(r"[-+]?(?:\d{1,3}(?:\.\d{3})+|\d+)(?:,\d+)?")),
+    (" ", ".", re.compile(r"[-+]?(?:\d{1,3}(?: \d{3})+|\d+)(?:\.\d+)?")),
+)
+
+_CURRENCY = re.compile(f"[{CURRENCY_SYMBOLS}]")
+
+def is_text(series):
+    """
+    Checks if a column holds strings, either as 'object' or as a pandas string dtype.
+
+    Parameters
+    ----------
+    series : pd.Series
+        The column to be checked.
+
+    Returns
+    -------
+    bool
+        True if the column is a text column, False otherwise.
+    """
+    return series.dtype == 'object' or isinstance(series.dtype, pd.StringDtype)
+
+def sample_values(series, sample_size=SAMPLE_SIZE):
+    """
+    Returns up to sample_size non-missing values of a column as stripped strings.
+
+    The values are taken at evenly spaced positions, so the sample covers the whole
+    column and is the same on every call.
+
+    Parameters
+    ----------
+    series : pd.Series
+        The column to be sampled.
+    sample_size : int, optional
+        The maximum number of values. The default is SAMPLE_SIZE.
+
+    Returns
+    -------
+    pd.Series
+        The sampled values.
+    """
+    if len(series) > sample_size:
+        positions = np.unique(np.linspace(0, len(series) - 1, sample_size).astype(np.int64))
+        series = series.iloc[positions]
+    values = series.dropna().astype(str).str.strip()
+    return values[values != ""]
+
+def infer_column_type(series, sample_size=SAMPLE_SIZE):
+    """
+    Infers the type of a text column from a sample of its values.
+
+    The sample must consistently match one of the following, checked in this order:
+    - 'numeric': numbers with an optional currency symbol and thousands separator.
+    - 'boolean': one of the pairs in BOOLEAN_VALUES, case insensitive.
+    - 'datetime': a single datetime format, from DATETIME_FORMATS or guessed by pandas.
+    Anything else is a 'string' column.
+
+    Parameters
+    ----------
+    series : pd.Series
+        The column to be checked.
+    sample_size : int, optional
+        The maximum number of values looked at. The default is SAMPLE_SIZE.
+
+    Returns
+    -------
+    dict
+        The type specification, a JSON serializable dictionary with a 'kind' key and the
+        details needed by convert_column.
+    """
+    values = sample_values(series, sample_size)
+    if values.empty:
+        return {"kind": "string"}
+
+    #Money
+    numbers = values.str.replace(_CURRENCY, "", regex=True).str.strip()
+    for thousands, decimal, pattern in NUMERIC_PATTERNS:
+        if numbers.str.fullmatch(pattern).all():
+            return {
+                "kind": "numeric",
+                "thousands": thousands,
+                "decimal": decimal,
+                "currency": bool(values.str.contains(_CURRENCY).any()),
+            }
+
+    #Boolean
+    lowered = set(values.str.lower().unique())
+    for true_value, false_value in BOOLEAN_VALUES:
+        if lowered <= {true_value, false_value}:
+            return {"kind": "boolean", "true": true_value, "false": false_value}
+
+    #Date and Time
+    if values.str.contains(r"\d").all():
+        for datetime_format in _datetime_candidates(values.iloc[0]):
+            parsed = pd.to_datetime(values, format=datetime_format, errors="coerce")
+            if parsed.notna().all():
+                return {"kind": "datetime", "format": datetime_format}
+
+    return {"kind": "string"}
+
+def _datetime_candidates(value):
+    candidates = list(DATETIME_FORMATS)
+    if guess_datetime_format is not None:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            guessed = guess_datetime_format(value)
+        if guessed is not None and guessed not in candidates:
+            candidates.insert(0, guessed)
+    return candidates
+
+def convert_column(series, spec):
+    """
+    Converts a whole text column according to a type specification.
+
+    Numbers, booleans and datetimes are converted with vectorized parsers. If the
+    conversion would turn a value that is present into a missing one, the sample did
+    not represent the column and it is handled as a 'string' column instead.
+
+    Parameters
+    ----------
+    series : pd.Series
+        The column to be converted.
+    spec : dict
+        The type specification, as returned by infer_column_type.
+
+    Returns
+    -------
+    tuple
+        The converted column and the specification that was actually applied.
+    """
+    kind = spec["kind"]
+    if kind != "string":
+        text = series.astype(str).str.strip().where(series.notna())
+        text = text.mask(text == "")
+        if kind == "numeric":
+            text = text.str.replace(_CURRENCY, "", regex=True).str.strip()
+            text = text.str.replace(spec["thousands"], "", regex=False)
+            if spec["decimal"] != ".":
+                text = text.str.replace(spec["decimal"], ".", regex=False)
+            converted = pd.to_numeric(text, errors="coerce").astype(float)
+        elif kind == "boolean":
+            converted = text.str.lower().map({spec["true"]: True, spec["false"]: False})
+        else:
+            converted = pd.to_datetime(text, format=spec["format"], errors="coerce")
+
+        if not (converted.isna() & text.notna()).any():
+            if kind == "boolean":
+                converted = converted.astype("boolean" if converted.isna().any() else bool)
+            return converted.rename(series.name), spec
+        spec = {"kind": "string"}
+
+    #General Strings
+    return series.str.lower().str.replace(" ", ""), spec